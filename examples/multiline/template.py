@@ -49,9 +49,10 @@ class Multiline(templates.Template):
 
         return data
 
-    def init_save(self, root):
+    def init_save(self, root, part=None):
         os.makedirs(root, exist_ok=True)
-        gt_path = os.path.join(root, "gt.txt")
+        suffix = f".{part}" if part is not None else ""
+        gt_path = os.path.join(root, f"gt{suffix}.txt")
         self.gt_file = open(gt_path, "w", encoding="utf-8")
 
     def save(self, root, data, idx):
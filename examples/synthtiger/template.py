@@ -40,6 +40,7 @@ class SynthTiger(templates.Template):
         self.vertical = config.get("vertical", False)
         self.quality = config.get("quality", [95, 95])
         self.visibility_check = config.get("visibility_check", False)
+        self.single_pass = config.get("single_pass", False)
         self.midground = config.get("midground", 0)
         self.midground_offset = components.Translate(
             **config.get("midground_offset", {})
@@ -106,8 +107,9 @@ class SynthTiger(templates.Template):
         )
 
     def generate(self):
-        quality = np.random.randint(self.quality[0], self.quality[1] + 1)
-        midground = np.random.rand() < self.midground
+        random_state = utils.get_random_state()
+        quality = random_state.randint(self.quality[0], self.quality[1] + 1)
+        midground = random_state.rand() < self.midground
         fg_color, fg_style, mg_color, mg_style, bg_color = self._generate_color()
 
         fg_image, label, bboxes, glyph_fg_image, glyph_bboxes = self._generate_text(
@@ -137,12 +139,13 @@ class SynthTiger(templates.Template):
 
         return data
 
-    def init_save(self, root):
+    def init_save(self, root, part=None):
         os.makedirs(root, exist_ok=True)
 
-        gt_path = os.path.join(root, "gt.txt")
-        coords_path = os.path.join(root, "coords.txt")
-        glyph_coords_path = os.path.join(root, "glyph_coords.txt")
+        suffix = f".{part}" if part is not None else ""
+        gt_path = os.path.join(root, f"gt{suffix}.txt")
+        coords_path = os.path.join(root, f"coords{suffix}.txt")
+        glyph_coords_path = os.path.join(root, f"glyph_coords{suffix}.txt")
 
         self.gt_file = open(gt_path, "w", encoding="utf-8")
         if self.coord_output:
@@ -222,8 +225,16 @@ class SynthTiger(templates.Template):
         text = "".join(chars)
         font = self.font.sample({"text": text, "vertical": self.vertical})
 
-        char_layers = [layers.TextLayer(char, **font) for char in chars]
-        self.shape.apply(char_layers)
+        # text is rendered at once unless chars are distorted individually
+        shape = self.shape.sample() if self.single_pass else None
+        single_pass = shape is not None and not shape["state"]
+
+        with utils.profile_block("text_layer"):
+            if single_pass:
+                char_layers = layers.TextLayer.from_chars(chars, **font)
+            else:
+                char_layers = [layers.TextLayer(char, **font) for char in chars]
+        self.shape.apply(char_layers, shape)
         self.layout.apply(char_layers, {"meta": {"vertical": self.vertical}})
         char_glyph_layers = [char_layer.copy() for char_layer in char_layers]
 
@@ -277,11 +288,17 @@ class SynthTiger(templates.Template):
 
 
 def _blend_images(src, dst, visibility_check=False):
-    blend_modes = np.random.permutation(BLEND_MODES)
+    random_state = utils.get_random_state()
+    blend_modes = random_state.permutation(BLEND_MODES)
 
     for blend_mode in blend_modes:
         out = utils.blend_image(src, dst, mode=blend_mode)
-        if not visibility_check or _check_visibility(out, src[..., 3]):
+        if not visibility_check:
+            break
+
+        with utils.profile_block("check_visibility"):
+            visible = _check_visibility(out, src[..., 3])
+        if visible:
             break
     else:
         raise RuntimeError("Text is not visible")
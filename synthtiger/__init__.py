@@ -9,6 +9,7 @@ from synthtiger._version import __version__
 from synthtiger.gen import (
     generator,
     get_global_random_states,
+    merge_parts,
     read_config,
     read_template,
     set_global_random_seed,
@@ -22,6 +23,7 @@ __all__ = [
     "utils",
     "generator",
     "get_global_random_states",
+    "merge_parts",
     "read_config",
     "read_template",
     "set_global_random_seed",
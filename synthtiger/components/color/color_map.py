@@ -4,8 +4,7 @@ Copyright (c) 2021-present NAVER Corp.
 MIT license
 """
 
-import numpy as np
-
+from synthtiger import utils
 from synthtiger.components.component import Component
 
 
@@ -17,7 +16,7 @@ class ColorMap(Component):
         self.k = k
         self._cluster_groups = []
         self._counts = []
-        self._probs = np.array(self.weights) / sum(self.weights)
+        self._sampler = utils.AliasSampler(self.weights)
         self._update_cluster_groups()
 
     def _update_cluster_groups(self):
@@ -48,12 +47,13 @@ class ColorMap(Component):
             self._counts.append(len(cluster_group))
 
     def _sample_colormap(self):
-        key = np.random.choice(len(self.paths), p=self._probs)
+        random_state = utils.get_random_state()
+        key = self._sampler.sample()
         if self._counts[key] == 0:
             raise RuntimeError(f"There is no colormap: {self.paths[key]}")
 
         cluster_group = self._cluster_groups[key]
-        clusters = cluster_group[np.random.randint(len(cluster_group))]
-        colormap = [np.random.normal(center, std) for center, std in clusters]
-        colormap = np.random.permutation(colormap)
+        clusters = cluster_group[random_state.randint(len(cluster_group))]
+        colormap = [random_state.normal(center, std) for center, std in clusters]
+        colormap = random_state.permutation(colormap)
         return colormap
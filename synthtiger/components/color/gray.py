@@ -21,9 +21,10 @@ class Gray(Component):
         if meta is None:
             meta = {}
 
-        gray = meta.get("gray", np.random.randint(self.gray[0], self.gray[1] + 1))
-        alpha = meta.get("alpha", np.random.uniform(self.alpha[0], self.alpha[1]))
-        colorize = meta.get("colorize", np.random.rand() < self.colorize)
+        random_state = utils.get_random_state()
+        gray = meta.get("gray", random_state.randint(self.gray[0], self.gray[1] + 1))
+        alpha = meta.get("alpha", random_state.uniform(self.alpha[0], self.alpha[1]))
+        colorize = meta.get("colorize", random_state.rand() < self.colorize)
         rgb = meta.get("rgb", utils.to_rgb(gray, colorize))
 
         meta = {
@@ -4,8 +4,6 @@ Copyright (c) 2021-present NAVER Corp.
 MIT license
 """
 
-import numpy as np
-
 from synthtiger import utils
 from synthtiger.components.color.color_map import ColorMap
 
@@ -20,6 +18,7 @@ class GrayMap(ColorMap):
         if meta is None:
             meta = []
 
+        random_state = utils.get_random_state()
         if len(self.paths) == 0:
             raise RuntimeError("Gray map path is not specified")
         if len(self.paths) != len(self.weights):
@@ -32,8 +31,8 @@ class GrayMap(ColorMap):
 
         for color in colormap:
             gray = round(color[0])
-            alpha = np.random.uniform(self.alpha[0], self.alpha[1])
-            colorize = np.random.rand() < self.colorize
+            alpha = random_state.uniform(self.alpha[0], self.alpha[1])
+            colorize = random_state.rand() < self.colorize
             rgb = utils.to_rgb(gray, colorize)
             new_meta.append(
                 {
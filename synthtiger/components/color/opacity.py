@@ -4,8 +4,7 @@ Copyright (c) 2021-present NAVER Corp.
 MIT license
 """
 
-import numpy as np
-
+from synthtiger import utils
 from synthtiger.components.component import Component
 
 
@@ -18,8 +17,9 @@ class Opacity(Component):
         if meta is None:
             meta = {}
 
+        random_state = utils.get_random_state()
         opacity = meta.get(
-            "opacity", np.random.uniform(self.opacity[0], self.opacity[1])
+            "opacity", random_state.uniform(self.opacity[0], self.opacity[1])
         )
 
         meta = {
@@ -21,16 +21,17 @@ class RGB(Component):
         if meta is None:
             meta = {}
 
+        random_state = utils.get_random_state()
         rgb = meta.get(
             "rgb",
             (
-                np.random.randint(self.rgb[0][0], self.rgb[0][1] + 1),
-                np.random.randint(self.rgb[1][0], self.rgb[1][1] + 1),
-                np.random.randint(self.rgb[2][0], self.rgb[2][1] + 1),
+                random_state.randint(self.rgb[0][0], self.rgb[0][1] + 1),
+                random_state.randint(self.rgb[1][0], self.rgb[1][1] + 1),
+                random_state.randint(self.rgb[2][0], self.rgb[2][1] + 1),
             ),
         )
-        alpha = meta.get("alpha", np.random.uniform(self.alpha[0], self.alpha[1]))
-        grayscale = meta.get("grayscale", np.random.rand() < self.grayscale)
+        alpha = meta.get("alpha", random_state.uniform(self.alpha[0], self.alpha[1]))
+        grayscale = meta.get("grayscale", random_state.rand() < self.grayscale)
 
         meta = {
             "rgb": rgb,
@@ -4,8 +4,6 @@ Copyright (c) 2021-present NAVER Corp.
 MIT license
 """
 
-import numpy as np
-
 from synthtiger import utils
 from synthtiger.components.color.color_map import ColorMap
 
@@ -20,6 +18,7 @@ class RGBMap(ColorMap):
         if meta is None:
             meta = []
 
+        random_state = utils.get_random_state()
         if len(self.paths) == 0:
             raise RuntimeError("RGB map path is not specified")
         if len(self.paths) != len(self.weights):
@@ -32,8 +31,8 @@ class RGBMap(ColorMap):
 
         for color in colormap:
             rgb = tuple(map(round, color))
-            alpha = np.random.uniform(self.alpha[0], self.alpha[1])
-            grayscale = np.random.rand() < self.grayscale
+            alpha = random_state.uniform(self.alpha[0], self.alpha[1])
+            grayscale = random_state.rand() < self.grayscale
             new_meta.append(
                 {
                     "rgb": rgb,
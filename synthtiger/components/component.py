@@ -6,11 +6,19 @@ MIT license
 
 from abc import ABC, abstractmethod
 
+from synthtiger.utils.profile_util import profile_method
+
 
 class Component(ABC):
     def __init__(self, *args, **kwargs):
         pass
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for name in ["sample", "apply", "data"]:
+            if name in cls.__dict__:
+                setattr(cls, name, profile_method(cls.__dict__[name]))
+
     @abstractmethod
     def sample(self, meta=None):
         pass
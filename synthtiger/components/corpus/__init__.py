@@ -9,5 +9,11 @@ from synthtiger.components.corpus.char_augmentable_corpus import CharAugmentable
 from synthtiger.components.corpus.length_augmentable_corpus import (
     LengthAugmentableCorpus,
 )
+from synthtiger.components.corpus.streaming_corpus import StreamingCorpus
 
-__all__ = ["BaseCorpus", "CharAugmentableCorpus", "LengthAugmentableCorpus"]
+__all__ = [
+    "BaseCorpus",
+    "CharAugmentableCorpus",
+    "LengthAugmentableCorpus",
+    "StreamingCorpus",
+]
@@ -4,8 +4,10 @@ Copyright (c) 2021-present NAVER Corp.
 MIT license
 """
 
-import io
-import sys
+import array
+import hashlib
+import json
+import os
 
 import numpy as np
 
@@ -22,6 +24,7 @@ class BaseCorpus(Component):
         max_length=None,
         charset=None,
         textcase=None,
+        cache_dir=None,
     ):
         super().__init__()
         self.paths = paths
@@ -30,10 +33,13 @@ class BaseCorpus(Component):
         self.max_length = max_length
         self.charset = charset
         self.textcase = textcase
+        self.cache_dir = cache_dir
         self._contents = []
         self._offsets = []
+        self._ids = []
         self._counts = []
-        self._probs = np.array(self.weights) / sum(self.weights)
+        self._length_indices = {}
+        self._sampler = utils.AliasSampler(self.weights)
         self._charset = set()
         self._update_charset()
         self._update_contents()
@@ -49,7 +55,11 @@ class BaseCorpus(Component):
                 "The number of weights does not match the number of corpus paths"
             )
 
-        text = self._sample_text()
+        # length limits of texts in addition to those of the corpus
+        min_length = meta.get("min_length")
+        max_length = meta.get("max_length")
+
+        text = self._sample_text(min_length, max_length)
         text = self._random_textcase(text)
         text = meta.get("text", text)
 
@@ -71,35 +81,138 @@ class BaseCorpus(Component):
     def _update_contents(self):
         self._contents = []
         self._offsets = []
+        self._ids = []
         self._counts = []
+        self._length_indices = {}
 
         for path in self.paths:
-            offset = 0
-            count = 0
-            contents = io.StringIO()
-            offsets = io.BytesIO()
-            offsets.write(offset.to_bytes(4, sys.byteorder, signed=False))
+            if utils.is_corpus_file(path):
+                self._read_corpus_file(path)
+            else:
+                self._read_text_file(path)
+
+    def _read_text_file(self, path):
+        contents = np.zeros(0, dtype=np.uint8)
+        if os.path.getsize(path) > 0:
+            contents = np.memmap(path, dtype=np.uint8, mode="r")
+
+        # byte offsets of starts and ends of filtered lines
+        offsets = self._read_index(path, self._build_text_index)
+
+        self._contents.append(contents)
+        self._offsets.append(offsets)
+        self._ids.append(None)
+        self._counts.append(len(offsets))
+
+    def _read_corpus_file(self, path):
+        contents, offsets, meta = utils.read_corpus_file(path)
+        count = len(offsets) - 1
+        ids = None
+
+        # texts are filtered again only if filters differ from prebuilt ones
+        filters = self._get_filters()
+        if any(
+            value is not None and value != meta.get(name)
+            for name, value in filters.items()
+        ):
+            ids = self._read_index(
+                path, lambda path: self._build_corpus_index(contents, offsets)
+            )
+            count = len(ids)
+
+        self._contents.append(contents)
+        self._offsets.append(offsets)
+        self._ids.append(ids)
+        self._counts.append(count)
+
+    def _build_text_index(self, path):
+        offsets = array.array("Q")
+        offset = 0
+
+        with open(path, "rb") as fp:
+            for line in fp:
+                start, end = offset, offset + len(line)
+                offset = end
+
+                text = line.decode("utf-8")
+                # line breaks are 1 byte in UTF-8
+                start += len(text) - len(text.lstrip("\r\n"))
+                end = max(end - len(text) + len(text.rstrip("\r\n")), start)
+                text = text.strip("\r\n")
+
+                if not self._check_length(text):
+                    continue
+                if not self._check_charset(text):
+                    continue
 
-            with open(path, "r", encoding="utf-8") as fp:
-                for text in fp:
-                    text = text.strip("\r\n")
+                offsets.extend((start, end))
 
-                    if not self._check_length(text):
-                        continue
-                    if not self._check_charset(text):
-                        continue
+        offsets = np.frombuffer(offsets, dtype=np.uint64).reshape(-1, 2)
+        return offsets
 
-                    contents.write(text)
-                    offset += len(text)
-                    offsets.write(offset.to_bytes(4, sys.byteorder, signed=False))
-                    count += 1
+    def _build_corpus_index(self, contents, offsets):
+        ids = array.array("Q")
+
+        for idx in range(len(offsets) - 1):
+            text = _decode_text(contents, offsets, idx)
+            if self._check_length(text) and self._check_charset(text):
+                ids.append(idx)
+
+        ids = np.frombuffer(ids, dtype=np.uint64)
+        return ids
+
+    def _read_index(self, path, build, name="index", params=None):
+        cache_path = self._get_cache_path(path, name, params)
+
+        if cache_path is not None and os.path.exists(cache_path):
+            try:
+                return np.load(cache_path, mmap_mode="r")
+            except ValueError:
+                # empty arrays can not be memory-mapped
+                return np.load(cache_path)
+            except OSError:
+                pass
+
+        index = build(path)
+
+        if cache_path is not None:
+            try:
+                os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+                tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+                with open(tmp_path, "wb") as fp:
+                    np.save(fp, index)
+                os.replace(tmp_path, cache_path)
+            except OSError:
+                pass
+
+        return index
+
+    def _get_cache_path(self, path, name="index", params=None):
+        if self.cache_dir is None:
+            return None
+
+        # indices are invalidated when files, filters or params are changed
+        stat = os.stat(path)
+        key = [os.path.abspath(path), stat.st_mtime_ns, stat.st_size]
+        key += [self._get_filters(), params]
+        key = hashlib.sha1(json.dumps(key).encode("utf-8")).hexdigest()
+        cache_dir = os.path.expanduser(self.cache_dir)
+        cache_path = os.path.join(cache_dir, f"corpus_{name}_{key}.npy")
+        return cache_path
+
+    def _get_filters(self):
+        charset = None
+        if self.charset is not None:
+            charset = "".join(sorted(self._charset)).encode("utf-8")
+            charset = hashlib.sha1(charset).hexdigest()
 
-            self._contents.append(contents.getvalue())
-            self._offsets.append(np.frombuffer(offsets.getvalue(), dtype=np.uint32))
-            self._counts.append(count)
+        filters = {
+            "min_length": self.min_length,
+            "max_length": self.max_length,
+            "charset": charset,
+        }
 
-            contents.close()
-            offsets.close()
+        return filters
 
     def _check_length(self, text):
         if self.min_length is not None and len(text) < self.min_length:
@@ -115,17 +228,87 @@ class BaseCorpus(Component):
         return True
 
     def _get_text(self, key, idx):
-        start = self._offsets[key][idx]
-        end = self._offsets[key][idx + 1]
-        text = self._contents[key][start:end]
+        if self._ids[key] is not None:
+            idx = int(self._ids[key][idx])
+
+        text = _decode_text(self._contents[key], self._offsets[key], idx)
         return text
 
-    def _sample_text(self):
-        key = np.random.choice(len(self.paths), p=self._probs)
+    def _get_ranges(self, key, start, end):
+        # byte ranges of texts from start to end
+        idxes = np.arange(start, end)
+        if self._ids[key] is not None:
+            idxes = self._ids[key][start:end].astype(np.int64)
+
+        offsets = self._offsets[key]
+        if offsets.ndim == 2:
+            starts, ends = offsets[idxes, 0], offsets[idxes, 1]
+        else:
+            starts, ends = offsets[idxes], offsets[idxes + 1]
+
+        return starts.astype(np.int64), ends.astype(np.int64)
+
+    def _get_length_index(self, key):
+        # ids of texts sorted by length, and positions of lengths in them
+        if key not in self._length_indices:
+            path = self.paths[key]
+            index = self._read_index(
+                path, lambda path: self._build_length_index(key), name="length_index"
+            )
+            lengths = index[1]
+            bounds = np.searchsorted(lengths, np.arange(2**12 + 1))
+            self._length_indices[key] = (index[0], lengths, bounds)
+
+        return self._length_indices[key]
+
+    def _build_length_index(self, key):
+        count = self._counts[key]
+        lengths = np.empty(count, dtype=np.uint64)
+        for start in range(0, count, 2**16):
+            end = min(start + 2**16, count)
+            starts, ends = self._get_ranges(key, start, end)
+            lengths[start:end] = _count_chars(self._contents[key], starts, ends)
+
+        ids = np.argsort(lengths, kind="stable").astype(np.uint64)
+        index = np.stack([ids, lengths[ids]])
+        return index
+
+    def _get_position(self, key, length):
+        # position of the first text not shorter than length in ids sorted by length
+        _, lengths, bounds = self._get_length_index(key)
+        if length < len(bounds):
+            return int(bounds[max(length, 0)])
+        return int(np.searchsorted(lengths, length))
+
+    def _get_length_range(self, key, min_length=None, max_length=None):
+        start = self._get_position(key, min_length or 0)
+        end = self._counts[key]
+        if max_length is not None:
+            end = self._get_position(key, max_length + 1)
+        return start, end
+
+    def _sample_id(self, key, min_length=None, max_length=None):
+        random_state = utils.get_random_state()
+        if min_length is None and max_length is None:
+            return random_state.randint(self._counts[key])
+
+        start, end = self._get_length_range(key, min_length, max_length)
+        if start >= end:
+            raise RuntimeError(
+                f"There is no text of length {min_length}-{max_length}: "
+                f"{self.paths[key]}"
+            )
+
+        ids = self._get_length_index(key)[0]
+        idx = int(ids[random_state.randint(start, end)])
+        return idx
+
+    def _sample_text(self, min_length=None, max_length=None):
+        key = self._sampler.sample()
         if self._counts[key] == 0:
             raise RuntimeError(f"There is no text: {self.paths[key]}")
 
-        idx = np.random.randint(self._counts[key])
+        idx = self._sample_id(key, min_length, max_length)
         text = self._get_text(key, idx)
         return text
 
@@ -133,7 +316,8 @@ class BaseCorpus(Component):
         if self.textcase is None:
             return text
 
-        textcase = self.textcase[np.random.randint(len(self.textcase))]
+        random_state = utils.get_random_state()
+        textcase = self.textcase[random_state.randint(len(self.textcase))]
 
         if textcase == "lower":
             text = text.lower()
@@ -143,3 +327,26 @@ class BaseCorpus(Component):
             text = text.capitalize()
 
         return text
+
+
+def _decode_text(contents, offsets, idx):
+    # offsets are pairs of starts and ends, or boundaries of contiguous texts
+    if offsets.ndim == 2:
+        start, end = offsets[idx]
+    else:
+        start, end = offsets[idx], offsets[idx + 1]
+
+    text = contents[start:end].tobytes().decode("utf-8")
+    return text
+
+
+def _count_chars(contents, starts, ends):
+    # numbers of UTF-8 chars between starts and ends, counted by non-continuation bytes
+    lengths = ends - starts
+    bounds = np.concatenate([[0], np.cumsum(lengths)])
+    shifts = np.repeat(starts - bounds[:-1], lengths)
+    positions = np.arange(bounds[-1]) + shifts
+
+    heads = (contents[positions] & 0xC0) != 0x80
+    counts = np.concatenate([[0], np.cumsum(heads)])
+    return counts[bounds[1:]] - counts[bounds[:-1]]
@@ -4,7 +4,7 @@ Copyright (c) 2021-present NAVER Corp.
 MIT license
 """
 
-from collections import Counter
+import hashlib
 
 import numpy as np
 
@@ -23,8 +23,17 @@ class CharAugmentableCorpus(BaseCorpus):
         textcase=None,
         augmentation=0,
         augmentation_charset=None,
+        cache_dir=None,
     ):
-        super().__init__(paths, weights, min_length, max_length, charset, textcase)
+        super().__init__(
+            paths,
+            weights,
+            min_length,
+            max_length,
+            charset,
+            textcase,
+            cache_dir=cache_dir,
+        )
         self.augmentation = augmentation
         self.augmentation_charset = augmentation_charset
         self._augmentation_charset = set()
@@ -32,45 +41,118 @@ class CharAugmentableCorpus(BaseCorpus):
         self._update_dists()
 
     def _update_dists(self):
-        self._charset = set()
+        self._augmentation_charset = set()
         self._dists = []
+        params = None
 
         if self.augmentation > 0:
             self._augmentation_charset = utils.read_charset(self.augmentation_charset)
+            params = "".join(sorted(self._augmentation_charset)).encode("utf-8")
+            params = hashlib.sha1(params).hexdigest()
 
-        for key in range(len(self.paths)):
-            count = self._counts[key]
-            if self.augmentation == 0:
-                dist = np.ones(count, dtype=np.float32)
-            else:
-                char_count = Counter()
-                for idx in range(count):
-                    text = self._get_text(key, idx)
-                    char_count.update(set(text))
-
-                dist = np.empty(count, dtype=np.float32)
-                for idx in range(count):
-                    text = self._get_text(key, idx)
-                    charset = set(text) & self._augmentation_charset
-                    dist[idx] = sum([1 / char_count[char] for char in charset])
-
-            total = np.sum(dist)
-            if total > 0:
-                dist /= total
-            dist = np.cumsum(dist)
+        for key, path in enumerate(self.paths):
+            dist = self._read_index(
+                path, lambda path: self._build_dist(key), name="dist", params=params
+            )
             self._dists.append(dist)
 
-    def _sample_text(self):
-        augmentation = np.random.rand() < self.augmentation
+    def _build_dist(self, key):
+        count = self._counts[key]
+
+        if self.augmentation == 0:
+            dist = np.ones(count, dtype=np.float32)
+        else:
+            chars = sorted(self._augmentation_charset)
+            lookup = np.full(0x110000, -1, dtype=np.int32)
+            lookup[[ord(char) for char in chars]] = np.arange(len(chars))
+            dtype = np.uint16 if len(chars) <= 2**16 else np.int32
+            ids = [np.zeros(0, dtype=dtype)]
+            lengths = [np.zeros(0, dtype=np.int64)]
+
+            # unique chars of lines in augmentation charset, decoded in chunks
+            for start in range(0, count, 2**16):
+                end = min(start + 2**16, count)
+                starts, ends = self._get_ranges(key, start, end)
+                lines, codes = _decode_chars(self._contents[key], starts, ends)
+                char_ids = lookup[codes]
+                lines, char_ids = lines[char_ids >= 0], char_ids[char_ids >= 0]
+                pairs = np.unique(lines * len(chars) + char_ids)
+                ids.append((pairs % len(chars)).astype(dtype))
+                lengths.append(np.bincount(pairs // len(chars), minlength=end - start))
+
+            ids = np.concatenate(ids)
+            lengths = np.concatenate(lengths)
+            char_counts = np.bincount(ids, minlength=len(chars))
+            weights = np.zeros(len(chars), dtype=np.float64)
+            weights[char_counts > 0] = 1 / char_counts[char_counts > 0]
+
+            dist = np.empty(count, dtype=np.float32)
+            ends = np.cumsum(lengths, dtype=np.int64)
+            starts = ends - lengths
+
+            # weights of chars are summed per line, in chunks to bound memory
+            for start in range(0, count, 2**20):
+                end = min(start + 2**20, count)
+                lines = np.repeat(np.arange(end - start), lengths[start:end])
+                chunk_ids = ids[starts[start] : ends[end - 1]]
+                dist[start:end] = np.bincount(
+                    lines, weights=weights[chunk_ids], minlength=end - start
+                )
+
+        total = np.sum(dist)
+        if total > 0:
+            dist /= total
+        dist = np.cumsum(dist)
+
+        return dist
+
+    def _sample_text(self, min_length=None, max_length=None):
+        random_state = utils.get_random_state()
+        augmentation = random_state.rand() < self.augmentation
         if not augmentation:
-            return super()._sample_text()
+            return super()._sample_text(min_length, max_length)
 
-        key = np.random.choice(len(self.paths), p=self._probs)
+        key = self._sampler.sample()
         if self._counts[key] == 0:
             raise RuntimeError(f"There is no text: {self.paths[key]}")
 
-        value = np.random.rand() * self._dists[key][-1]
-        idx = np.searchsorted(self._dists[key], value)
-        idx = min(idx, self._counts[key] - 1)
+        # texts are drawn by rarity until one fits length limits
+        for _ in range(100):
+            value = random_state.rand() * self._dists[key][-1]
+            idx = np.searchsorted(self._dists[key], value)
+            idx = min(idx, self._counts[key] - 1)
+            text = self._get_text(key, idx)
+
+            if min_length is not None and len(text) < min_length:
+                continue
+            if max_length is not None and len(text) > max_length:
+                continue
+
+            return text
+
+        idx = self._sample_id(key, min_length, max_length)
         text = self._get_text(key, idx)
         return text
+
+
+def _decode_chars(contents, starts, ends):
+    # code points of UTF-8 texts between starts and ends, and indices of texts
+    lengths = ends - starts
+    total = int(np.sum(lengths))
+    lines = np.repeat(np.arange(len(lengths)), lengths)
+    shifts = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+    positions = np.arange(total) + shifts
+
+    # padded so that continuation bytes of any char can be read
+    data = np.zeros(total + 3, dtype=np.int64)
+    data[:total] = contents[positions]
+    heads = np.flatnonzero((data[:total] & 0xC0) != 0x80)
+
+    lead = data[heads]
+    sizes = 1 + (lead >= 0xC0) + (lead >= 0xE0) + (lead >= 0xF0)
+    codes = lead & np.array([0, 0x7F, 0x1F, 0x0F, 0x07])[sizes]
+    for offset in range(1, 4):
+        mask = sizes > offset
+        codes[mask] = (codes[mask] << 6) | (data[heads[mask] + offset] & 0x3F)
+
+    return lines[heads], codes
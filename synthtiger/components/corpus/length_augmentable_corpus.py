@@ -4,8 +4,7 @@ Copyright (c) 2021-present NAVER Corp.
 MIT license
 """
 
-import numpy as np
-
+from synthtiger import utils
 from synthtiger.components.corpus.base_corpus import BaseCorpus
 
 
@@ -20,28 +19,55 @@ class LengthAugmentableCorpus(BaseCorpus):
         textcase=None,
         augmentation=0,
         augmentation_length=(1, 25),
+        cache_dir=None,
     ):
-        super().__init__(paths, weights, min_length, max_length, charset, textcase)
+        super().__init__(
+            paths,
+            weights,
+            min_length,
+            max_length,
+            charset,
+            textcase,
+            cache_dir=cache_dir,
+        )
         self.augmentation = augmentation
         self.augmentation_length = augmentation_length
 
-    def _sample_text(self):
-        augmentation = np.random.rand() < self.augmentation
+    def _sample_text(self, min_length=None, max_length=None):
+        random_state = utils.get_random_state()
+        augmentation = random_state.rand() < self.augmentation
         if not augmentation:
-            return super()._sample_text()
+            return super()._sample_text(min_length, max_length)
 
-        text = ""
-        length = np.random.randint(
+        texts = []
+        text_length = 0
+        length = random_state.randint(
             self.augmentation_length[0], self.augmentation_length[1] + 1
         )
+        if min_length is not None:
+            length = max(length, min_length)
+        if max_length is not None:
+            length = min(length, max_length)
 
-        while len(text) < length:
-            key = np.random.choice(len(self.paths), p=self._probs)
+        while text_length < length:
+            key = self._sampler.sample()
             if self._counts[key] == 0:
                 raise RuntimeError(f"There is no text: {self.paths[key]}")
 
-            idx = np.random.randint(self._counts[key])
-            text += self._get_text(key, idx)
+            start, end = 0, 0
+            if min_length is not None or max_length is not None:
+                # texts fitting in the rest are preferred, so that they are not cut
+                start, end = self._get_length_range(key, 1, length - text_length)
+
+            if start < end:
+                ids = self._get_length_index(key)[0]
+                idx = int(ids[random_state.randint(start, end)])
+            else:
+                idx = random_state.randint(self._counts[key])
+
+            text = self._get_text(key, idx)
+            texts.append(text)
+            text_length += len(text)
 
-        text = text[:length]
+        text = "".join(texts)[:length]
         return text
@@ -0,0 +1,262 @@
+"""
+SynthTIGER
+Copyright (c) 2021-present NAVER Corp.
+MIT license
+"""
+
+import array
+import os
+import zlib
+
+import numpy as np
+
+from synthtiger import utils
+from synthtiger.components.corpus.base_corpus import BaseCorpus
+
+COMPRESSED_EXTS = [".gz", ".zst"]
+
+
+class StreamingCorpus(BaseCorpus):
+    def __init__(
+        self,
+        paths=(),
+        weights=(),
+        min_length=None,
+        max_length=None,
+        charset=None,
+        textcase=None,
+        block_size=2**16,
+        max_retry=1000,
+        frame_cache_size=2**26,
+        cache_dir="~/.cache/synthtiger",
+    ):
+        self.block_size = block_size
+        self.max_retry = max_retry
+        self.frame_cache_size = frame_cache_size
+        self._files = []
+        self._blocks = []
+        self._ends = []
+        # decompressed frames of compressed files
+        self._frames = utils.LRUCache(frame_cache_size, size_func=len)
+        super().__init__(
+            paths,
+            weights,
+            min_length,
+            max_length,
+            charset,
+            textcase,
+            cache_dir=cache_dir,
+        )
+
+    def _update_contents(self):
+        self._files = []
+        self._blocks = []
+        self._ends = []
+        self._counts = []
+        self._frames.clear()
+
+        for path in self.paths:
+            files = [path]
+            if os.path.isdir(path):
+                exts = [".txt", *COMPRESSED_EXTS]
+                files = sorted(utils.search_files(path, exts=exts))
+
+            # file indices, byte offsets, line counts and line starts of blocks,
+            # invalidated when any of the files is changed
+            blocks = self._read_index(
+                path,
+                lambda path: self._build_blocks(files),
+                name="block_index",
+                params=[self.block_size, [_get_stat(file) for file in files]],
+            )
+            ends = np.cumsum(blocks[:, 3], dtype=np.int64)
+
+            self._files.append(files)
+            self._blocks.append(blocks)
+            self._ends.append(ends)
+            self._counts.append(int(ends[-1]) if len(ends) > 0 else 0)
+
+    def _build_blocks(self, files):
+        blocks = array.array("Q")
+
+        for file_idx, file in enumerate(files):
+            if _is_compressed(file):
+                self._build_frame_blocks(blocks, file_idx, file)
+                continue
+
+            with open(file, "rb") as fp:
+                while True:
+                    start = fp.tell()
+                    data = fp.read(self.block_size)
+                    if len(data) == 0:
+                        break
+
+                    # blocks end at line breaks
+                    data += fp.readline()
+                    end = start + len(data)
+                    count = len(_split_lines(data))
+                    blocks.extend((file_idx, start, end, count, 0))
+
+        blocks = np.frombuffer(blocks, dtype=np.uint64).reshape(-1, 5)
+        return blocks
+
+    def _build_frame_blocks(self, blocks, file_idx, file):
+        # lines belong to frames where they start
+        is_open = False
+
+        for start, end, size, count, head, tail in _scan_frames(file):
+            self._check_frame(file, size)
+            skip = 0
+            if is_open:
+                skip = head + 1 if head is not None else size
+
+            count = int(size > 0 and not is_open) + count - int(tail == b"\n")
+            blocks.extend((file_idx, start, end, count, skip))
+            is_open = (size > 0 and tail != b"\n") or (size == 0 and is_open)
+
+    def _get_text(self, key, idx):
+        block_idx = int(np.searchsorted(self._ends[key], idx, side="right"))
+        count = int(self._blocks[key][block_idx][3])
+        line_idx = idx - (int(self._ends[key][block_idx]) - count)
+
+        data = self._read_block(key, block_idx)
+        text = _split_lines(data)[line_idx].decode("utf-8").strip("\r\n")
+        return text
+
+    def _read_block(self, key, block_idx):
+        blocks = self._blocks[key]
+        file_idx, start, end, _, skip = [int(value) for value in blocks[block_idx]]
+        file = self._files[key][file_idx]
+
+        if not _is_compressed(file):
+            with open(file, "rb") as fp:
+                fp.seek(start)
+                data = fp.read(end - start)
+            return data
+
+        data = self._read_frame(file, start, end)[skip:]
+
+        # the last line may continue in the next frames
+        for next_idx in range(block_idx + 1, len(blocks)):
+            if data.endswith(b"\n") or int(blocks[next_idx][0]) != file_idx:
+                break
+
+            next_start, next_end = [int(value) for value in blocks[next_idx][1:3]]
+            next_data = self._read_frame(file, next_start, next_end)
+            pos = next_data.find(b"\n")
+            data += next_data if pos < 0 else next_data[: pos + 1]
+
+        return data
+
+    def _read_frame(self, file, start, end):
+        frame = self._frames.get((file, start))
+
+        if frame is None:
+            with open(file, "rb") as fp:
+                fp.seek(start)
+                data = fp.read(end - start)
+
+            decompressor = _get_decompressor(file)
+            frame = decompressor.decompress(data)
+            self._check_frame(file, len(frame))
+            self._frames.put((file, start), frame)
+
+        return frame
+
+    def _check_frame(self, file, size):
+        # frames larger than the cache would be decompressed at every sample
+        if size > self.frame_cache_size:
+            raise RuntimeError(
+                f"Frame of {size} bytes is larger than frame cache size: {file} "
+                "(compress it in smaller frames by bgzip or pzstd, "
+                "or increase frame_cache_size)"
+            )
+
+    def _sample_text(self, min_length=None, max_length=None):
+        random_state = utils.get_random_state()
+        key = self._sampler.sample()
+        if self._counts[key] == 0:
+            raise RuntimeError(f"There is no text: {self.paths[key]}")
+
+        # lines are filtered at sampling, since they are not loaded in advance
+        for _ in range(self.max_retry):
+            idx = random_state.randint(self._counts[key])
+            text = self._get_text(key, idx)
+
+            if min_length is not None and len(text) < min_length:
+                continue
+            if max_length is not None and len(text) > max_length:
+                continue
+            if self._check_length(text) and self._check_charset(text):
+                return text
+
+        raise RuntimeError(f"There is no text that passes filters: {self.paths[key]}")
+
+
+def _split_lines(data):
+    lines = data.split(b"\n")
+    if lines[-1] == b"":
+        lines.pop()
+    return lines
+
+
+def _get_stat(path):
+    stat = os.stat(path)
+    return [os.path.abspath(path), stat.st_mtime_ns, stat.st_size]
+
+
+def _is_compressed(path):
+    ext = os.path.splitext(path)[1].lower()
+    return ext in COMPRESSED_EXTS
+
+
+def _get_decompressor(path):
+    ext = os.path.splitext(path)[1].lower()
+
+    if ext == ".gz":
+        return zlib.decompressobj(wbits=31)
+
+    if ext == ".zst":
+        import zstandard
+
+        return zstandard.ZstdDecompressor().decompressobj()
+
+    raise RuntimeError(f"Unknown compression: {path}")
+
+
+def _scan_frames(path, chunk_size=2**20):
+    # yields offsets, decompressed size, line count, first line break and last
+    # byte of each frame (gzip member or zstd frame), without keeping frames
+    offset = 0
+    buffer = b""
+
+    with open(path, "rb") as fp:
+        while True:
+            if len(buffer) == 0:
+                buffer = fp.read(chunk_size)
+                if len(buffer) == 0:
+                    break
+
+            decompressor = _get_decompressor(path)
+            start = offset
+            size, count, head, tail = 0, 0, None, b""
+
+            while True:
+                data = decompressor.decompress(buffer)
+                if head is None and b"\n" in data:
+                    head = size + data.find(b"\n")
+                size += len(data)
+                count += data.count(b"\n")
+                tail = data[-1:] if len(data) > 0 else tail
+
+                if decompressor.eof:
+                    offset += len(buffer) - len(decompressor.unused_data)
+                    buffer = decompressor.unused_data
+                    break
+
+                offset += len(buffer)
+                buffer = fp.read(chunk_size)
+                if len(buffer) == 0:
+                    raise RuntimeError(f"Compressed file is truncated: {path}")
+
+            yield start, offset, size, count, head, tail
@@ -4,10 +4,11 @@ Copyright (c) 2021-present NAVER Corp.
 MIT license
 """
 
+import hashlib
+import json
 import os
 
 import numpy as np
-from PIL import ImageFont
 
 from synthtiger import utils
 from synthtiger.components.component import Component
@@ -21,6 +22,9 @@ class BaseFont(Component):
         size=(16, 48),
         bold=0,
         vertical=False,
+        backend="pil",
+        cache_dir=None,
+        manifest=False,
     ):
         super().__init__()
         self.paths = paths
@@ -28,11 +32,16 @@ class BaseFont(Component):
         self.size = size
         self.bold = bold
         self.vertical = vertical
+        self.backend = backend
+        self.cache_dir = cache_dir
+        self.manifest = manifest
         self._paths = []
         self._counts = []
-        self._probs = np.array(self.weights) / sum(self.weights)
+        self._sampler = utils.AliasSampler(self.weights)
         self._tables = []
         self._ids = []
+        # fonts that can render recent texts
+        self._candidates = utils.LRUCache(2**24, size_func=lambda value: value.nbytes)
         self._update_paths()
         self._update_tables()
 
@@ -40,6 +49,7 @@ class BaseFont(Component):
         if meta is None:
             meta = {}
 
+        random_state = utils.get_random_state()
         if len(self.paths) == 0:
             raise RuntimeError("Font path is not specified")
         if len(self.paths) != len(self.weights):
@@ -49,21 +59,23 @@ class BaseFont(Component):
 
         text = meta.get("text")
         path = meta.get("path", self._sample_font(text))
-        size = meta.get("size", np.random.randint(self.size[0], self.size[1] + 1))
-        bold = meta.get("bold", np.random.rand() < self.bold)
+        size = meta.get("size", random_state.randint(self.size[0], self.size[1] + 1))
+        bold = meta.get("bold", random_state.rand() < self.bold)
         vertical = meta.get("vertical", self.vertical)
+        backend = meta.get("backend", self.backend)
 
         meta = {
             "path": path,
             "size": size,
             "bold": bold,
             "vertical": vertical,
+            "backend": backend,
         }
 
         return meta
 
     def data(self, meta):
-        font = ImageFont.truetype(meta["path"], size=meta["size"])
+        font = utils.read_font(meta["path"], meta["size"])
         stroke_width = int(meta["bold"])
         direction = "ltr" if not meta["vertical"] else "ttb"
         return font, stroke_width, direction
@@ -78,7 +90,9 @@ class BaseFont(Component):
 
             paths = [path]
             if os.path.isdir(path):
-                paths = utils.search_files(path, exts=[".ttf", ".otf"])
+                paths = utils.search_files(
+                    path, exts=[".ttf", ".otf"], manifest=self.manifest
+                )
 
             self._paths.append(paths)
             self._counts.append(len(paths))
@@ -88,23 +102,78 @@ class BaseFont(Component):
         self._ids = []
 
         for paths in self._paths:
-            glyphset = set()
-
-            for path in paths:
-                glyphs = self._read_glyphs(path)
-                glyphset.update(glyphs)
-
-            self._ids.append({})
-            for glyph in glyphset:
-                self._ids[-1][glyph] = len(self._ids[-1])
-
-            size = (len(paths), len(self._ids[-1]))
-            self._tables.append(np.zeros(size, dtype=bool))
-
-            for idx, path in enumerate(paths):
-                glyphs = self._read_glyphs(path)
-                ids = [self._ids[-1][glyph] for glyph in glyphs]
-                self._tables[-1][idx][ids] = True
+            table, glyphs = self._read_table(paths)
+            self._tables.append(table)
+            self._ids.append({glyph: idx for idx, glyph in enumerate(glyphs)})
+
+    def _read_table(self, paths):
+        cache_path = self._get_cache_path(paths)
+
+        if cache_path is not None and os.path.exists(f"{cache_path}.json"):
+            try:
+                table = np.load(f"{cache_path}.npy", mmap_mode="r")
+                with open(f"{cache_path}.json", "r", encoding="utf-8") as fp:
+                    glyphs = json.load(fp)
+                return table, glyphs
+            except (OSError, ValueError):
+                pass
+
+        table, glyphs = self._build_table(paths)
+
+        if cache_path is not None and table.size > 0:
+            try:
+                self._write_table(cache_path, table, glyphs)
+            except OSError:
+                pass
+
+        return table, glyphs
+
+    def _build_table(self, paths):
+        font_glyphs = [self._read_glyphs(path) for path in paths]
+        glyphs = sorted(set().union(*font_glyphs))
+        ids = {glyph: idx for idx, glyph in enumerate(glyphs)}
+
+        # fonts covering each glyph are packed into bits, 8 fonts per byte
+        table = np.zeros((len(glyphs), (len(paths) + 7) // 8), dtype=np.uint8)
+        for idx, glyphs_of_font in enumerate(font_glyphs):
+            rows = [ids[glyph] for glyph in glyphs_of_font]
+            table[rows, idx >> 3] |= 1 << (7 - (idx & 7))
+
+        return table, glyphs
+
+    def _write_table(self, cache_path, table, glyphs):
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+
+        with open(tmp_path, "wb") as fp:
+            np.save(fp, table)
+        os.replace(tmp_path, f"{cache_path}.npy")
+
+        with open(tmp_path, "w", encoding="utf-8") as fp:
+            json.dump(glyphs, fp, ensure_ascii=False)
+        os.replace(tmp_path, f"{cache_path}.json")
+
+    def _get_cache_path(self, paths):
+        if self.cache_dir is None:
+            return None
+
+        # tables are invalidated when fonts or their charsets are changed
+        stats = []
+        for path in paths:
+            for file_path in (path, f"{os.path.splitext(path)[0]}.txt"):
+                stat = os.stat(file_path) if os.path.exists(file_path) else None
+                stats.append(
+                    [
+                        os.path.abspath(file_path),
+                        stat.st_mtime_ns if stat is not None else None,
+                        stat.st_size if stat is not None else None,
+                    ]
+                )
+
+        key = hashlib.sha1(json.dumps(stats).encode("utf-8")).hexdigest()
+        cache_dir = os.path.expanduser(self.cache_dir)
+        cache_path = os.path.join(cache_dir, f"font_index_{key}")
+        return cache_path
 
     def _read_glyphs(self, path):
         glyphs = []
@@ -117,27 +186,39 @@ class BaseFont(Component):
         return glyphs
 
     def _sample_font(self, text=None):
-        key = np.random.choice(len(self.paths), p=self._probs)
+        random_state = utils.get_random_state()
+        key = self._sampler.sample()
         if self._counts[key] == 0:
             raise RuntimeError(f"There is no font: {self.paths[key]}")
 
         if text is None:
-            idx = np.random.randint(len(self._paths[key]))
+            idx = random_state.randint(len(self._paths[key]))
             path = self._paths[key][idx]
             return path
 
         # https://en.wikipedia.org/wiki/Backslash
         text = text.replace("\\", "＼")
 
-        ids = [self._ids[key].get(char) for char in text]
+        idxes = self._candidates.get((key, text))
+        if idxes is None:
+            idxes = self._get_candidates(key, text)
+            self._candidates.put((key, text), idxes)
+
+        idx = idxes[random_state.randint(len(idxes))]
+        path = self._paths[key][idx]
+        return path
+
+    def _get_candidates(self, key, text):
+        ids = [self._ids[key].get(char) for char in set(text)]
         if None in ids:
             raise RuntimeError(
                 f"There is no font that can render text '{text}': {self.paths[key]}"
             )
 
-        table = self._tables[key][..., ids]
-        counts = np.sum(table, axis=1)
-        idxes = np.argwhere(counts == len(text)).flatten()
-        idx = idxes[np.random.randint(len(idxes))]
-        path = self._paths[key][idx]
-        return path
+        bits = np.full(self._tables[key].shape[1], 255, dtype=np.uint8)
+        if len(ids) > 0:
+            bits = np.bitwise_and.reduce(self._tables[key][ids], axis=0)
+
+        covers = np.unpackbits(bits)[: len(self._paths[key])]
+        idxes = np.flatnonzero(covers).astype(np.int32)
+        return idxes
@@ -7,6 +7,7 @@ MIT license
 import imgaug.augmenters as iaa
 import numpy as np
 
+from synthtiger import utils
 from synthtiger.components.component import Component
 
 
@@ -20,8 +21,9 @@ class AdditiveGaussianNoise(Component):
         if meta is None:
             meta = {}
 
-        scale = meta.get("scale", np.random.uniform(self.scale[0], self.scale[1]))
-        per_channel = meta.get("per_channel", np.random.rand() < self.per_channel)
+        random_state = utils.get_random_state()
+        scale = meta.get("scale", random_state.uniform(self.scale[0], self.scale[1]))
+        per_channel = meta.get("per_channel", random_state.rand() < self.per_channel)
 
         meta = {
             "scale": scale,
@@ -34,7 +36,8 @@ class AdditiveGaussianNoise(Component):
         meta = self.sample(meta)
         scale = meta["scale"]
         per_channel = meta["per_channel"]
-        aug = iaa.AdditiveGaussianNoise(scale=scale, per_channel=per_channel)
+        rng = utils.get_imgaug_rng()
+        aug = iaa.AdditiveGaussianNoise(scale=scale, per_channel=per_channel, seed=rng)
 
         for layer in layers:
             rgb = layer.image[..., :3].astype(np.uint8)
@@ -6,6 +6,7 @@ MIT license
 
 import numpy as np
 
+from synthtiger import utils
 from synthtiger.components.component import Component
 
 
@@ -18,7 +19,8 @@ class Brightness(Component):
         if meta is None:
             meta = {}
 
-        beta = meta.get("beta", np.random.randint(self.beta[0], self.beta[1] + 1))
+        random_state = utils.get_random_state()
+        beta = meta.get("beta", random_state.randint(self.beta[0], self.beta[1] + 1))
 
         meta = {
             "beta": beta,
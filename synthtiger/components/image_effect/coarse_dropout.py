@@ -7,6 +7,7 @@ MIT license
 import imgaug.augmenters as iaa
 import numpy as np
 
+from synthtiger import utils
 from synthtiger.components.component import Component
 
 
@@ -30,18 +31,21 @@ class CoarseDropout(Component):
         if meta is None:
             meta = {}
 
-        p = meta.get("p", np.random.uniform(self.p[0], self.p[1]))
-        per_channel = meta.get("per_channel", np.random.rand() < self.per_channel)
-        only_alpha = meta.get("only_alpha", np.random.rand() < self.only_alpha)
+        random_state = utils.get_random_state()
+        p = meta.get("p", random_state.uniform(self.p[0], self.p[1]))
+        per_channel = meta.get("per_channel", random_state.rand() < self.per_channel)
+        only_alpha = meta.get("only_alpha", random_state.rand() < self.only_alpha)
 
         size_px = None
         if self.size_px is not None:
-            size_px = np.random.randint(self.size_px[0], self.size_px[1] + 1)
+            size_px = random_state.randint(self.size_px[0], self.size_px[1] + 1)
         size_px = meta.get("size_px", size_px)
 
         size_percent = None
         if self.size_percent is not None:
-            size_percent = np.random.uniform(self.size_percent[0], self.size_percent[1])
+            size_percent = random_state.uniform(
+                self.size_percent[0], self.size_percent[1]
+            )
         size_percent = meta.get("size_percent", size_percent)
 
         meta = {
@@ -61,8 +65,13 @@ class CoarseDropout(Component):
         size_percent = meta["size_percent"]
         per_channel = meta["per_channel"]
         only_alpha = meta["only_alpha"]
+        rng = utils.get_imgaug_rng()
         aug = iaa.CoarseDropout(
-            p=p, size_px=size_px, size_percent=size_percent, per_channel=per_channel
+            p=p,
+            size_px=size_px,
+            size_percent=size_percent,
+            per_channel=per_channel,
+            seed=rng,
         )
 
         for layer in layers:
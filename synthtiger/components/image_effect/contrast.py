@@ -6,6 +6,7 @@ MIT license
 
 import numpy as np
 
+from synthtiger import utils
 from synthtiger.components.component import Component
 
 
@@ -18,7 +19,8 @@ class Contrast(Component):
         if meta is None:
             meta = {}
 
-        alpha = meta.get("alpha", np.random.uniform(self.alpha[0], self.alpha[1]))
+        random_state = utils.get_random_state()
+        alpha = meta.get("alpha", random_state.uniform(self.alpha[0], self.alpha[1]))
 
         meta = {
             "alpha": alpha,
@@ -4,8 +4,6 @@ Copyright (c) 2021-present NAVER Corp.
 MIT license
 """
 
-import numpy as np
-
 from synthtiger import utils
 from synthtiger.components.component import Component
 
@@ -19,7 +17,8 @@ class Dilate(Component):
         if meta is None:
             meta = {}
 
-        k = meta.get("k", np.random.randint(self.k[0], self.k[1] + 1))
+        random_state = utils.get_random_state()
+        k = meta.get("k", random_state.randint(self.k[0], self.k[1] + 1))
 
         meta = {
             "k": k,
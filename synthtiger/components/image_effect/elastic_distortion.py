@@ -7,6 +7,7 @@ MIT license
 import imgaug.augmenters as iaa
 import numpy as np
 
+from synthtiger import utils
 from synthtiger.components.component import Component
 
 
@@ -20,8 +21,9 @@ class ElasticDistortion(Component):
         if meta is None:
             meta = {}
 
-        alpha = meta.get("alpha", np.random.uniform(self.alpha[0], self.alpha[1]))
-        sigma = meta.get("sigma", np.random.uniform(self.sigma[0], self.sigma[1]))
+        random_state = utils.get_random_state()
+        alpha = meta.get("alpha", random_state.uniform(self.alpha[0], self.alpha[1]))
+        sigma = meta.get("sigma", random_state.uniform(self.sigma[0], self.sigma[1]))
 
         meta = {
             "alpha": alpha,
@@ -34,7 +36,10 @@ class ElasticDistortion(Component):
         meta = self.sample(meta)
         alpha = meta["alpha"]
         sigma = meta["sigma"]
-        aug = iaa.ElasticTransformation(alpha=alpha, sigma=sigma, mode="nearest")
+        rng = utils.get_imgaug_rng()
+        aug = iaa.ElasticTransformation(
+            alpha=alpha, sigma=sigma, mode="nearest", seed=rng
+        )
 
         for layer in layers:
             image = layer.image.astype(np.uint8)
@@ -7,6 +7,7 @@ MIT license
 import imgaug.augmenters as iaa
 import numpy as np
 
+from synthtiger import utils
 from synthtiger.components.component import Component
 
 
@@ -19,7 +20,10 @@ class GaussianBlur(Component):
         if meta is None:
             meta = {}
 
-        sigma = meta.get("sigma", np.random.randint(self.sigma[0], self.sigma[1] + 1))
+        random_state = utils.get_random_state()
+        sigma = meta.get(
+            "sigma", random_state.randint(self.sigma[0], self.sigma[1] + 1)
+        )
 
         meta = {
             "sigma": sigma,
@@ -30,7 +34,8 @@ class GaussianBlur(Component):
     def apply(self, layers, meta=None):
         meta = self.sample(meta)
         sigma = meta["sigma"]
-        aug = iaa.GaussianBlur(sigma=sigma)
+        rng = utils.get_imgaug_rng()
+        aug = iaa.GaussianBlur(sigma=sigma, seed=rng)
 
         for layer in layers:
             image = layer.image.astype(np.uint8)
@@ -7,6 +7,7 @@ MIT license
 import imgaug.augmenters as iaa
 import numpy as np
 
+from synthtiger import utils
 from synthtiger.components.component import Component
 
 
@@ -21,8 +22,9 @@ class ImageRotate(Component):
         if meta is None:
             meta = {}
 
-        angle = meta.get("angle", np.random.uniform(self.angle[0], self.angle[1]))
-        ccw = meta.get("ccw", np.random.rand() < self.ccw)
+        random_state = utils.get_random_state()
+        angle = meta.get("angle", random_state.uniform(self.angle[0], self.angle[1]))
+        ccw = meta.get("ccw", random_state.rand() < self.ccw)
         mode = meta.get("mode", self.mode)
 
         meta = {
@@ -37,7 +39,8 @@ class ImageRotate(Component):
         meta = self.sample(meta)
         angle = meta["angle"] * (-1 if meta["ccw"] else 1)
         mode = meta["mode"]
-        aug = iaa.Rotate(rotate=angle, mode=mode)
+        rng = utils.get_imgaug_rng()
+        aug = iaa.Rotate(rotate=angle, mode=mode, seed=rng)
 
         for layer in layers:
             image = layer.image.astype(np.uint8)
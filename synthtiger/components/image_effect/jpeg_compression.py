@@ -7,6 +7,7 @@ MIT license
 import imgaug.augmenters as iaa
 import numpy as np
 
+from synthtiger import utils
 from synthtiger.components.component import Component
 
 
@@ -19,9 +20,10 @@ class JpegCompression(Component):
         if meta is None:
             meta = {}
 
+        random_state = utils.get_random_state()
         compression = meta.get(
             "compression",
-            np.random.randint(self.compression[0], self.compression[1] + 1),
+            random_state.randint(self.compression[0], self.compression[1] + 1),
         )
 
         meta = {
@@ -33,7 +35,8 @@ class JpegCompression(Component):
     def apply(self, layers, meta=None):
         meta = self.sample(meta)
         compression = meta["compression"]
-        aug = iaa.JpegCompression(compression=compression)
+        rng = utils.get_imgaug_rng()
+        aug = iaa.JpegCompression(compression=compression, seed=rng)
 
         for layer in layers:
             rgb = layer.image[..., :3].astype(np.uint8)
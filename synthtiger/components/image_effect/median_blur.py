@@ -7,6 +7,7 @@ MIT license
 import imgaug.augmenters as iaa
 import numpy as np
 
+from synthtiger import utils
 from synthtiger.components.component import Component
 
 
@@ -19,7 +20,8 @@ class MedianBlur(Component):
         if meta is None:
             meta = {}
 
-        k = meta.get("k", np.random.randint(self.k[0], self.k[1] + 1))
+        random_state = utils.get_random_state()
+        k = meta.get("k", random_state.randint(self.k[0], self.k[1] + 1))
 
         meta = {
             "k": k,
@@ -30,7 +32,8 @@ class MedianBlur(Component):
     def apply(self, layers, meta=None):
         meta = self.sample(meta)
         k = meta["k"] * 2 + 1
-        aug = iaa.MedianBlur(k=k)
+        rng = utils.get_imgaug_rng()
+        aug = iaa.MedianBlur(k=k, seed=rng)
 
         for layer in layers:
             image = layer.image.astype(np.uint8)
@@ -7,6 +7,7 @@ MIT license
 import imgaug.augmenters as iaa
 import numpy as np
 
+from synthtiger import utils
 from synthtiger.components.component import Component
 
 
@@ -20,8 +21,9 @@ class MotionBlur(Component):
         if meta is None:
             meta = {}
 
-        k = meta.get("k", np.random.randint(self.k[0], self.k[1] + 1))
-        angle = meta.get("angle", np.random.uniform(self.angle[0], self.angle[1]))
+        random_state = utils.get_random_state()
+        k = meta.get("k", random_state.randint(self.k[0], self.k[1] + 1))
+        angle = meta.get("angle", random_state.uniform(self.angle[0], self.angle[1]))
 
         meta = {
             "k": k,
@@ -34,7 +36,8 @@ class MotionBlur(Component):
         meta = self.sample(meta)
         k = meta["k"]
         angle = meta["angle"]
-        aug = iaa.MotionBlur(k=k, angle=angle)
+        rng = utils.get_imgaug_rng()
+        aug = iaa.MotionBlur(k=k, angle=angle, seed=rng)
 
         for layer in layers:
             image = layer.image.astype(np.uint8)
@@ -7,6 +7,7 @@ MIT license
 import imgaug.augmenters as iaa
 import numpy as np
 
+from synthtiger import utils
 from synthtiger.components.component import Component
 
 
@@ -19,7 +20,8 @@ class Resample(Component):
         if meta is None:
             meta = {}
 
-        size = meta.get("size", np.random.uniform(self.size[0], self.size[1]))
+        random_state = utils.get_random_state()
+        size = meta.get("size", random_state.uniform(self.size[0], self.size[1]))
 
         meta = {
             "size": size,
@@ -30,9 +32,15 @@ class Resample(Component):
     def apply(self, layers, meta=None):
         meta = self.sample(meta)
         size = meta["size"]
+        rng = utils.get_imgaug_rng()
         aug = iaa.KeepSizeByResize(
-            iaa.Resize(size=size, interpolation=["nearest", "linear", "area", "cubic"]),
+            iaa.Resize(
+                size=size,
+                interpolation=["nearest", "linear", "area", "cubic"],
+                seed=rng,
+            ),
             interpolation=["nearest", "linear", "area", "cubic"],
+            seed=rng,
         )
 
         for layer in layers:
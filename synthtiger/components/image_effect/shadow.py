@@ -34,16 +34,21 @@ class Shadow(Component):
         if meta is None:
             meta = {}
 
+        random_state = utils.get_random_state()
         intensity = meta.get(
-            "intensity", np.random.randint(self.intensity[0], self.intensity[1] + 1)
+            "intensity", random_state.randint(self.intensity[0], self.intensity[1] + 1)
+        )
+        amount = meta.get(
+            "amount", random_state.uniform(self.amount[0], self.amount[1])
         )
-        amount = meta.get("amount", np.random.uniform(self.amount[0], self.amount[1]))
         smoothing = meta.get(
-            "smoothing", np.random.uniform(self.smoothing[0], self.smoothing[1])
+            "smoothing", random_state.uniform(self.smoothing[0], self.smoothing[1])
+        )
+        bidirectional = meta.get(
+            "bidirectional", random_state.rand() < self.bidirectional
         )
-        bidirectional = meta.get("bidirectional", np.random.rand() < self.bidirectional)
-        align = meta.get("align", np.random.uniform(self.align[0], self.align[1]))
-        angle = meta.get("angle", np.random.uniform(self.angle[0], self.angle[1]))
+        align = meta.get("align", random_state.uniform(self.align[0], self.align[1]))
+        angle = meta.get("angle", random_state.uniform(self.angle[0], self.angle[1]))
 
         meta = {
             "intensity": intensity,
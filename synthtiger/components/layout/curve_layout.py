@@ -7,6 +7,7 @@ MIT license
 import cv2
 import numpy as np
 
+from synthtiger import utils
 from synthtiger.components.component import Component
 
 
@@ -25,10 +26,15 @@ class CurveLayout(Component):
         if meta is None:
             meta = {}
 
-        curve = meta.get("curve", np.random.randint(self.curve[0], self.curve[1] + 1))
-        space = meta.get("space", np.random.randint(self.space[0], self.space[1] + 1))
-        convex = meta.get("convex", np.random.rand() < self.convex)
-        upward = meta.get("upward", np.random.rand() < self.upward)
+        random_state = utils.get_random_state()
+        curve = meta.get(
+            "curve", random_state.randint(self.curve[0], self.curve[1] + 1)
+        )
+        space = meta.get(
+            "space", random_state.randint(self.space[0], self.space[1] + 1)
+        )
+        convex = meta.get("convex", random_state.rand() < self.convex)
+        upward = meta.get("upward", random_state.rand() < self.upward)
         vertical = meta.get("vertical", self.vertical)
 
         meta = {
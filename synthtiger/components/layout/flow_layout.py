@@ -6,6 +6,7 @@ MIT license
 
 import numpy as np
 
+from synthtiger import utils
 from synthtiger.components.component import Component
 from synthtiger.layers import Group
 
@@ -36,19 +37,23 @@ class FlowLayout(Component):
         if meta is None:
             meta = {}
 
+        random_state = utils.get_random_state()
         length = meta.get(
             "length",
-            np.random.randint(self.length[0], self.length[1] + 1)
+            random_state.randint(self.length[0], self.length[1] + 1)
             if self.length is not None
             else None,
         )
-        space = meta.get("space", np.random.randint(self.space[0], self.space[1] + 1))
+        space = meta.get(
+            "space", random_state.randint(self.space[0], self.space[1] + 1)
+        )
         line_space = meta.get(
-            "line_space", np.random.randint(self.line_space[0], self.line_space[1] + 1)
+            "line_space",
+            random_state.randint(self.line_space[0], self.line_space[1] + 1),
         )
-        align = meta.get("align", self.align[np.random.randint(len(self.align))])
+        align = meta.get("align", self.align[random_state.randint(len(self.align))])
         line_align = meta.get(
-            "line_align", self.line_align[np.random.randint(len(self.line_align))]
+            "line_align", self.line_align[random_state.randint(len(self.line_align))]
         )
         ltr = meta.get("ltr", self.ltr)
         ttb = meta.get("ttb", self.ttb)
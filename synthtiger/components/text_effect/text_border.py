@@ -4,8 +4,6 @@ Copyright (c) 2021-present NAVER Corp.
 MIT license
 """
 
-import numpy as np
-
 from synthtiger import utils
 from synthtiger.components.color import RGB
 from synthtiger.components.component import Component
@@ -27,17 +25,18 @@ class TextBorder(Component):
         if meta is None:
             meta = {}
 
-        size = meta.get("size", np.random.randint(self.size[0], self.size[1] + 1))
+        random_state = utils.get_random_state()
+        size = meta.get("size", random_state.randint(self.size[0], self.size[1] + 1))
         rgb = meta.get(
             "rgb",
             (
-                np.random.randint(self.rgb[0][0], self.rgb[0][1] + 1),
-                np.random.randint(self.rgb[1][0], self.rgb[1][1] + 1),
-                np.random.randint(self.rgb[2][0], self.rgb[2][1] + 1),
+                random_state.randint(self.rgb[0][0], self.rgb[0][1] + 1),
+                random_state.randint(self.rgb[1][0], self.rgb[1][1] + 1),
+                random_state.randint(self.rgb[2][0], self.rgb[2][1] + 1),
             ),
         )
-        alpha = meta.get("alpha", np.random.uniform(self.alpha[0], self.alpha[1]))
-        grayscale = meta.get("grayscale", np.random.rand() < self.grayscale)
+        alpha = meta.get("alpha", random_state.uniform(self.alpha[0], self.alpha[1]))
+        grayscale = meta.get("grayscale", random_state.rand() < self.grayscale)
 
         meta = {
             "size": size,
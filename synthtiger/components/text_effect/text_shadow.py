@@ -6,6 +6,7 @@ MIT license
 
 import numpy as np
 
+from synthtiger import utils
 from synthtiger.components.color import RGB
 from synthtiger.components.component import Component
 
@@ -31,20 +32,21 @@ class TextShadow(Component):
         if meta is None:
             meta = {}
 
+        random_state = utils.get_random_state()
         distance = meta.get(
-            "distance", np.random.randint(self.distance[0], self.distance[1] + 1)
+            "distance", random_state.randint(self.distance[0], self.distance[1] + 1)
         )
-        angle = meta.get("angle", np.random.uniform(self.angle[0], self.angle[1]))
+        angle = meta.get("angle", random_state.uniform(self.angle[0], self.angle[1]))
         rgb = meta.get(
             "rgb",
             (
-                np.random.randint(self.rgb[0][0], self.rgb[0][1] + 1),
-                np.random.randint(self.rgb[1][0], self.rgb[1][1] + 1),
-                np.random.randint(self.rgb[2][0], self.rgb[2][1] + 1),
+                random_state.randint(self.rgb[0][0], self.rgb[0][1] + 1),
+                random_state.randint(self.rgb[1][0], self.rgb[1][1] + 1),
+                random_state.randint(self.rgb[2][0], self.rgb[2][1] + 1),
             ),
         )
-        alpha = meta.get("alpha", np.random.uniform(self.alpha[0], self.alpha[1]))
-        grayscale = meta.get("grayscale", np.random.rand() < self.grayscale)
+        alpha = meta.get("alpha", random_state.uniform(self.alpha[0], self.alpha[1]))
+        grayscale = meta.get("grayscale", random_state.rand() < self.grayscale)
 
         meta = {
             "distance": distance,
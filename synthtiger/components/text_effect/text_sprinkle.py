@@ -7,6 +7,7 @@ MIT license
 import cv2
 import numpy as np
 
+from synthtiger import utils
 from synthtiger.components.component import Component
 
 
@@ -21,9 +22,10 @@ class TextSprinkle(Component):
         if meta is None:
             meta = {}
 
-        prob = meta.get("prob", np.random.uniform(self.prob[0], self.prob[1]))
+        random_state = utils.get_random_state()
+        prob = meta.get("prob", random_state.uniform(self.prob[0], self.prob[1]))
         offset = meta.get("offset", (self.offset[0], self.offset[1]))
-        masking = meta.get("masking", np.random.rand() < self.masking)
+        masking = meta.get("masking", random_state.rand() < self.masking)
 
         meta = {
             "prob": prob,
@@ -35,6 +37,7 @@ class TextSprinkle(Component):
 
     def apply(self, layers, meta=None):
         meta = self.sample(meta)
+        random_state = utils.get_random_state()
         prob = meta["prob"]
         offset = meta["offset"]
         masking = meta["masking"]
@@ -43,8 +46,8 @@ class TextSprinkle(Component):
             height, width = layer.image.shape[:2]
 
             count = int(height * width * prob)
-            idxes = np.random.randint(height * width, size=count)
-            offsets = np.random.uniform(offset[0], offset[1], (count, 2))
+            idxes = random_state.randint(height * width, size=count)
+            offsets = random_state.uniform(offset[0], offset[1], (count, 2))
 
             dx = np.zeros(height * width, dtype=np.float32)
             dy = np.zeros(height * width, dtype=np.float32)
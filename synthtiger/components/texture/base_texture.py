@@ -14,22 +14,33 @@ from synthtiger.components.component import Component
 
 
 class BaseTexture(Component):
-    def __init__(self, paths=(), weights=(), alpha=(1, 1), grayscale=0, crop=0):
+    def __init__(
+        self,
+        paths=(),
+        weights=(),
+        alpha=(1, 1),
+        grayscale=0,
+        crop=0,
+        manifest=False,
+    ):
         super().__init__()
         self.paths = paths
         self.weights = weights
         self.alpha = alpha
         self.grayscale = grayscale
         self.crop = crop
+        self.manifest = manifest
         self._paths = []
         self._counts = []
-        self._probs = np.array(self.weights) / sum(self.weights)
+        self._sizes = {}
+        self._sampler = utils.AliasSampler(self.weights)
         self._update_paths()
 
     def sample(self, meta=None):
         if meta is None:
             meta = {}
 
+        random_state = utils.get_random_state()
         if len(self.paths) == 0:
             raise RuntimeError("Texture path is not specified")
         if len(self.paths) != len(self.weights):
@@ -38,15 +49,15 @@ class BaseTexture(Component):
             )
 
         path = meta.get("path", self._sample_texture())
-        alpha = meta.get("alpha", np.random.uniform(self.alpha[0], self.alpha[1]))
-        grayscale = meta.get("grayscale", np.random.rand() < self.grayscale)
-        crop = meta.get("crop", np.random.rand() < self.crop)
+        alpha = meta.get("alpha", random_state.uniform(self.alpha[0], self.alpha[1]))
+        grayscale = meta.get("grayscale", random_state.rand() < self.grayscale)
+        crop = meta.get("crop", random_state.rand() < self.crop)
 
         width, height = self._get_size(path)
-        w = meta.get("w", np.random.randint(1, width + 1) if crop else width)
-        h = meta.get("h", np.random.randint(1, height + 1) if crop else height)
-        x = meta.get("x", np.random.randint(0, width - w + 1) if crop else 0)
-        y = meta.get("y", np.random.randint(0, height - h + 1) if crop else 0)
+        w = meta.get("w", random_state.randint(1, width + 1) if crop else width)
+        h = meta.get("h", random_state.randint(1, height + 1) if crop else height)
+        x = meta.get("x", random_state.randint(0, width - w + 1) if crop else 0)
+        y = meta.get("y", random_state.randint(0, height - h + 1) if crop else 0)
 
         meta = {
             "path": path,
@@ -82,6 +93,7 @@ class BaseTexture(Component):
     def _update_paths(self):
         self._paths = []
         self._counts = []
+        self._sizes = {}
 
         for path in self.paths:
             if not os.path.exists(path):
@@ -89,11 +101,28 @@ class BaseTexture(Component):
 
             paths = [path]
             if os.path.isdir(path):
-                paths = utils.search_files(path, exts=[".jpg", ".jpeg", ".png", ".bmp"])
+                paths = utils.search_files(
+                    path, exts=[".jpg", ".jpeg", ".png", ".bmp"], manifest=self.manifest
+                )
+                self._update_sizes(path)
 
             self._paths.append(paths)
             self._counts.append(len(paths))
 
+    def _update_sizes(self, root):
+        files = utils.read_manifest(root)
+        if files is None:
+            return
+
+        for file in files:
+            if file["width"] is None or file["height"] is None:
+                continue
+
+            width, height = file["width"], file["height"]
+            if file["orientation"] >= 5:
+                width, height = height, width
+            self._sizes[file["path"]] = (width, height)
+
     def _read_texture(self, path, grayscale=False):
         texture = Image.open(path)
         texture = ImageOps.exif_transpose(texture)
@@ -104,6 +133,9 @@ class BaseTexture(Component):
         return texture
 
     def _get_size(self, path):
+        if path in self._sizes:
+            return self._sizes[path]
+
         texture = Image.open(path)
         width, height = texture.size
         exif = dict(texture.getexif())
@@ -112,10 +144,11 @@ class BaseTexture(Component):
         return width, height
 
     def _sample_texture(self):
-        key = np.random.choice(len(self.paths), p=self._probs)
+        random_state = utils.get_random_state()
+        key = self._sampler.sample()
         if self._counts[key] == 0:
             raise RuntimeError(f"There is no texture: {self.paths[key]}")
 
-        idx = np.random.randint(len(self._paths[key]))
+        idx = random_state.randint(len(self._paths[key]))
         path = self._paths[key][idx]
         return path
@@ -6,6 +6,7 @@ MIT license
 
 import numpy as np
 
+from synthtiger import utils
 from synthtiger.components.component import Component
 from synthtiger.layers import Group
 
@@ -23,9 +24,10 @@ class Align(Component):
         if meta is None:
             meta = {}
 
+        random_state = utils.get_random_state()
         aligns = meta.get(
             "aligns",
-            tuple(np.random.uniform(align[0], align[1]) for align in self.aligns),
+            tuple(random_state.uniform(align[0], align[1]) for align in self.aligns),
         )
 
         meta = {
@@ -28,16 +28,18 @@ class Pad(Component):
         if meta is None:
             meta = {}
 
+        random_state = utils.get_random_state()
         pxs = meta.get(
             "pxs",
-            tuple(np.random.randint(px[0], px[1] + 1) for px in self.pxs)
+            tuple(random_state.randint(px[0], px[1] + 1) for px in self.pxs)
             if self.pxs is not None
             else None,
         )
         percents = meta.get(
             "percents",
             tuple(
-                np.random.uniform(percent[0], percent[1]) for percent in self.percents
+                random_state.uniform(percent[0], percent[1])
+                for percent in self.percents
             )
             if self.percents is not None
             else None,
@@ -7,6 +7,7 @@ MIT license
 import cv2
 import numpy as np
 
+from synthtiger import utils
 from synthtiger.components.component import Component
 from synthtiger.layers import Group
 
@@ -32,23 +33,25 @@ class Perspective(Component):
         if meta is None:
             meta = {}
 
+        random_state = utils.get_random_state()
         pxs = meta.get(
             "pxs",
-            tuple(np.random.randint(px[0], px[1] + 1) for px in self.pxs)
+            tuple(random_state.randint(px[0], px[1] + 1) for px in self.pxs)
             if self.pxs is not None
             else None,
         )
         percents = meta.get(
             "percents",
             tuple(
-                np.random.uniform(percent[0], percent[1]) for percent in self.percents
+                random_state.uniform(percent[0], percent[1])
+                for percent in self.percents
             )
             if self.percents is not None
             else None,
         )
         aligns = meta.get(
             "aligns",
-            tuple(np.random.uniform(align[0], align[1]) for align in self.aligns),
+            tuple(random_state.uniform(align[0], align[1]) for align in self.aligns),
         )
 
         meta = {
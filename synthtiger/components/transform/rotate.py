@@ -7,6 +7,7 @@ MIT license
 import cv2
 import numpy as np
 
+from synthtiger import utils
 from synthtiger.components.component import Component
 from synthtiger.layers import Group
 
@@ -21,8 +22,9 @@ class Rotate(Component):
         if meta is None:
             meta = {}
 
-        angle = meta.get("angle", np.random.uniform(self.angle[0], self.angle[1]))
-        ccw = meta.get("ccw", np.random.rand() < self.ccw)
+        random_state = utils.get_random_state()
+        angle = meta.get("angle", random_state.uniform(self.angle[0], self.angle[1]))
+        ccw = meta.get("ccw", random_state.rand() < self.ccw)
 
         meta = {
             "angle": angle,
@@ -7,6 +7,7 @@ MIT license
 import cv2
 import numpy as np
 
+from synthtiger import utils
 from synthtiger.components.component import Component
 from synthtiger.layers import Group
 
@@ -17,15 +18,18 @@ class Skew(Component):
         self.weights = weights
         self.angle = angle
         self.ccw = ccw
-        self._probs = np.array(self.weights) / sum(self.weights)
+        if len(self.weights) != 2:
+            raise ValueError("The number of weights does not match the number of axes")
+        self._sampler = utils.AliasSampler(self.weights)
 
     def sample(self, meta=None):
         if meta is None:
             meta = {}
 
-        axis = meta.get("axis", np.random.choice(2, p=self._probs))
-        angle = meta.get("angle", np.random.uniform(self.angle[0], self.angle[1]))
-        ccw = meta.get("ccw", np.random.rand() < self.ccw)
+        random_state = utils.get_random_state()
+        axis = meta.get("axis", self._sampler.sample())
+        angle = meta.get("angle", random_state.uniform(self.angle[0], self.angle[1]))
+        ccw = meta.get("ccw", random_state.rand() < self.ccw)
 
         meta = {
             "axis": axis,
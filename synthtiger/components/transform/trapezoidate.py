@@ -7,6 +7,7 @@ MIT license
 import cv2
 import numpy as np
 
+from synthtiger import utils
 from synthtiger.components.component import Component
 from synthtiger.layers import Group
 
@@ -18,26 +19,29 @@ class Trapezoidate(Component):
         self.px = px
         self.percent = percent
         self.align = align
-        self._probs = np.array(self.weights) / sum(self.weights)
+        if len(self.weights) != 4:
+            raise ValueError("The number of weights does not match the number of sides")
+        self._sampler = utils.AliasSampler(self.weights)
 
     def sample(self, meta=None):
         if meta is None:
             meta = {}
 
-        side = meta.get("side", np.random.choice(4, p=self._probs))
+        random_state = utils.get_random_state()
+        side = meta.get("side", self._sampler.sample())
         px = meta.get(
             "px",
-            np.random.randint(self.px[0], self.px[1] + 1)
+            random_state.randint(self.px[0], self.px[1] + 1)
             if self.px is not None
             else None,
         )
         percent = meta.get(
             "percent",
-            np.random.uniform(self.percent[0], self.percent[1])
+            random_state.uniform(self.percent[0], self.percent[1])
             if self.percent is not None
             else None,
         )
-        align = meta.get("align", np.random.uniform(self.align[0], self.align[1]))
+        align = meta.get("align", random_state.uniform(self.align[0], self.align[1]))
 
         meta = {
             "side": side,
@@ -4,8 +4,7 @@ Copyright (c) 2021-present NAVER Corp.
 MIT license
 """
 
-import numpy as np
-
+from synthtiger import utils
 from synthtiger.components.component import Component
 
 
@@ -16,7 +15,7 @@ class Selector(Component):
         self.weights = weights
         if self.weights is None:
             self.weights = [1] * len(components)
-        self._probs = np.array(self.weights) / sum(self.weights)
+        self._sampler = utils.AliasSampler(self.weights)
 
         if args is not None:
             for component, arg in zip(self.components, args):
@@ -55,5 +54,5 @@ class Selector(Component):
         self.__init__(self.components, *args, **kwargs)
 
     def _sample_idx(self):
-        idx = np.random.choice(len(self.components), replace=False, p=self._probs)
+        idx = self._sampler.sample()
         return idx
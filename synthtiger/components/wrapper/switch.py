@@ -4,8 +4,7 @@ Copyright (c) 2021-present NAVER Corp.
 MIT license
 """
 
-import numpy as np
-
+from synthtiger import utils
 from synthtiger.components.component import Component
 
 
@@ -22,7 +21,8 @@ class Switch(Component):
         if meta is None:
             meta = {}
 
-        state = meta.get("state", np.random.rand() < self.prob)
+        random_state = utils.get_random_state()
+        state = meta.get("state", random_state.rand() < self.prob)
 
         sub_meta = None
         if state:
@@ -4,17 +4,25 @@ Copyright (c) 2021-present NAVER Corp.
 MIT license
 """
 
+import gc
 import itertools
 import os
+import queue
 import random
+import re
+import shutil
 import sys
+import threading
+import time
 import traceback
-from multiprocessing import Process, Queue
+from multiprocessing import get_context
 
 import imgaug
 import numpy as np
 import yaml
 
+from synthtiger import utils
+
 
 def read_template(path, name, config=None):
     path = os.path.abspath(path)
@@ -34,34 +42,265 @@ def read_config(path):
 
 
 def generator(
-    path, name, config=None, count=None, worker=0, seed=None, retry=True, verbose=False
+    path,
+    name,
+    config=None,
+    count=None,
+    worker=0,
+    seed=None,
+    retry=True,
+    verbose=False,
+    shared_memory=False,
+    slot_size=2**24,
+    output=None,
+    chunk_size=1,
+    prefetch=0,
+    skip=None,
+    shard=None,
+    max_retry=None,
+    timeout=None,
+    stats=None,
+    prefork=False,
+    backend="process",
+    global_random=True,
+    profile=None,
 ):
-    counter = range(count) if count is not None else itertools.count()
+    """
+    Generate data with a template.
+
+    If shared_memory is True, workers write numpy arrays of data into shared
+    memory slots and yielded arrays are views of those slots. A slot is reused
+    after the next data is requested, so copy arrays to keep them longer.
+
+    If output is given, data is saved by the workers instead of being yielded.
+    Each worker calls ``init_save(output, part)`` of its own template with the
+    worker index as part, so the template should write its files separately
+    for each part. The main process saves with part 0 if worker is 0. Part
+    files can be merged with :func:`merge_parts`.
+
+    Workers receive tasks in chunks of chunk_size and return data of a chunk
+    at once. At most worker + prefetch chunks are dispatched at the same time.
+
+    Tasks whose indices are in skip are not generated, while the seeds of other
+    tasks stay the same. It can be used to resume an interrupted generation.
+
+    If shard is (index, total), only tasks whose indices are congruent to index
+    modulo total are generated. Since the seeds of tasks depend only on seed,
+    shards generated separately make up the same data as a single generation.
+
+    If retry is True, failed generation is retried up to max_retry times and
+    is not retried after timeout seconds from the first attempt. Data is None
+    if it is not generated within them. If stats is given, the number of
+    failed attempts is added to it for each exception type name.
+
+    If prefork is True, the template is read once in the main process and
+    workers are forked from it, so that its data such as corpora and font
+    tables is shared copy-on-write instead of being read by each worker. It
+    requires the fork start method, which is not available on Windows.
+
+    If backend is "thread", workers are threads of the main process with their
+    own templates and random states, so that there is no cost of starting
+    processes and transferring data. Random numbers should be drawn from the
+    random states of :mod:`synthtiger.utils.random_util` instead of the global
+    ones. Shared memory and prefork are not used with threads.
+
+    Each task is generated in a :func:`synthtiger.utils.random_context` seeded
+    with the task seed, from which components draw random numbers. If
+    global_random is True, the global random states are also seeded with a
+    seed derived from the task seed for templates using them, so that they do
+    not repeat the numbers of the context, and restored after the task. They
+    are not seeded with threads.
+
+    If profile is given, wall time, call counts and output pixels of templates
+    and components are added to it as records of
+    :class:`synthtiger.utils.Profiler`, which can be formatted with
+    :func:`synthtiger.utils.format_profile`.
+
+    :param path: The template script path
+    :type path: str
+    :param name: The template class name
+    :type name: str
+    :param config: The template config
+    :type config: dict, optional
+    :param count: The number of data, infinite if None
+    :type count: int, optional
+    :param worker: The number of worker processes, main process if 0
+    :type worker: int, optional
+    :param seed: The random seed
+    :type seed: int, optional
+    :param retry: Whether to retry failed generation
+    :type retry: bool, optional
+    :param verbose: Whether to print error messages
+    :type verbose: bool, optional
+    :param shared_memory: Whether to transfer arrays through shared memory
+    :type shared_memory: bool, optional
+    :param slot_size: The byte size of a shared memory slot, larger data is pickled
+    :type slot_size: int, optional
+    :param output: The directory path to save data in workers
+    :type output: str, optional
+    :param chunk_size: The number of tasks sent to a worker at once
+    :type chunk_size: int, optional
+    :param prefetch: The number of chunks dispatched in addition to one per worker
+    :type prefetch: int, optional
+    :param skip: The task indices not to generate
+    :type skip: container, optional
+    :param shard: The shard index and the number of shards
+    :type shard: tuple, optional
+    :param max_retry: The maximum number of retries for a task, unlimited if None
+    :type max_retry: int, optional
+    :param timeout: The seconds after which a task is not retried, unlimited if None
+    :type timeout: float, optional
+    :param stats: The dict to count failures for each exception type name
+    :type stats: dict, optional
+    :param prefork: Whether to read the template before forking workers
+    :type prefork: bool, optional
+    :param backend: The type of workers, "process" or "thread"
+    :type backend: str, optional
+    :param global_random: Whether to seed the global random states for each task
+    :type global_random: bool, optional
+    :param profile: The dict to add profile records of templates and components
+    :type profile: dict, optional
+    :return: Generator of (task index, data), or (task index, whether data is
+        saved) if output is given
+    :rtype: generator
+    """
+
     tasks = _task_generator(seed)
+    if count is not None:
+        tasks = itertools.islice(tasks, count)
+    if shard is not None:
+        tasks = filter(lambda task: task[0] % shard[1] == shard[0], tasks)
+    if skip is not None:
+        tasks = filter(lambda task: task[0] not in skip, tasks)
 
     if worker > 0:
-        task_queue = Queue(maxsize=worker)
-        data_queue = Queue(maxsize=worker)
-        pre_count = min(worker, count) if count is not None else worker
-        post_count = count - pre_count if count is not None else None
-
-        for _ in range(worker):
-            _run(_worker, (path, name, config, task_queue, data_queue, retry, verbose))
-        for _ in range(pre_count):
-            task_queue.put(next(tasks))
-
-        for idx in counter:
-            task_idx, data = data_queue.get()
-            if post_count is None or idx < post_count:
-                task_queue.put(next(tasks))
-            yield task_idx, data
+        thread = backend == "thread"
+        global_random = global_random and not thread
+        profiling = profile is not None
+        context = _get_context(backend, prefork)
+        chunks = _chunk_generator(tasks, chunk_size)
+        task_queue = context.Queue()
+        data_queue = context.Queue(maxsize=worker + prefetch)
+        stop_event = context.Event()
+        procs = []
+        slots = []
+        slot_queue = None
+        pending = 0
+
+        if shared_memory and output is None and not thread:
+            slot_count = (worker + prefetch + 1) * chunk_size
+            slots = _create_slots(slot_count, slot_size)
+            slot_queue = context.Queue()
+            for idx in range(len(slots)):
+                slot_queue.put(idx)
+
+        template = (path, name, config)
+        if prefork and not thread:
+            template = read_template(path, name, config)
+            _freeze_objects()
+
+        slot_names = [slot.name for slot in slots]
+        args = (task_queue, data_queue)
+        args += (retry, max_retry, timeout, verbose, global_random, profiling)
+        args += (stop_event, slot_names, slot_queue, output)
+
+        for idx in range(worker):
+            if thread:
+                # importing a template script is not thread-safe
+                template = read_template(path, name, config)
+            procs.append(_run(_worker, (idx, template, *args), context))
+        for chunk in itertools.islice(chunks, worker + prefetch):
+            task_queue.put(chunk)
+            pending += 1
+
+        try:
+            while pending > 0:
+                results = _get_results(data_queue, procs)
+                pending -= 1
+
+                chunk = next(chunks, None)
+                if chunk is not None:
+                    task_queue.put(chunk)
+                    pending += 1
+
+                for task_idx, slot_idx, data, failures, records in results:
+                    _update_stats(stats, failures)
+                    _update_profile(profile, records)
+                    yield task_idx, _unpack_data(data, slots, slot_idx)
+                    if slot_idx is not None:
+                        slot_queue.put(slot_idx)
+        finally:
+            _stop_workers(procs, stop_event, task_queue, data_queue, slot_queue)
+            _release_slots(slots)
+            if prefork and not thread and hasattr(gc, "unfreeze"):
+                gc.unfreeze()
     else:
         template = read_template(path, name, config)
+        if output is not None:
+            template.init_save(output, "0")
+
+        try:
+            for task_idx, task_seed in tasks:
+                data, failures, records = _generate(
+                    template,
+                    task_seed,
+                    retry,
+                    max_retry,
+                    timeout,
+                    verbose,
+                    global_random,
+                    profile is not None,
+                )
+                _update_stats(stats, failures)
+                _update_profile(profile, records)
+                if output is not None:
+                    data = _save(template, output, data, task_idx)
+                yield task_idx, data
+        finally:
+            if output is not None:
+                template.end_save(output)
+
+
+def merge_parts(root, append=False):
+    """
+    Merge part files saved by workers into a single file.
+
+    Files named ``<name>.<part>.txt`` in the directory are concatenated into
+    ``<name>.txt`` in order of the part number and removed.
+
+    :param root: The directory path containing part files
+    :type root: str
+    :param append: Whether to append to existing merged files
+    :type append: bool, optional
+    :return: Paths of merged files
+    :rtype: list
+    """
+
+    parts = {}
+
+    for file_name in sorted(os.listdir(root)):
+        match = re.fullmatch(r"(.+)\.(\d+)\.txt", file_name)
+        if match is None:
+            continue
+
+        base_name, part = match.groups()
+        parts.setdefault(base_name, []).append((int(part), file_name))
 
-        for _ in counter:
-            task_idx, task_seed = next(tasks)
-            data = _generate(template, task_seed, retry, verbose)
-            yield task_idx, data
+    paths = []
+
+    for base_name, files in sorted(parts.items()):
+        path = os.path.join(root, f"{base_name}.txt")
+
+        with open(path, "ab" if append else "wb") as fp:
+            for _, file_name in sorted(files):
+                part_path = os.path.join(root, file_name)
+                with open(part_path, "rb") as part_fp:
+                    shutil.copyfileobj(part_fp, fp)
+                os.remove(part_path)
+
+        paths.append(path)
+
+    return paths
 
 
 def get_global_random_states():
@@ -85,13 +324,31 @@ def set_global_random_seed(seed=None):
     imgaug.random.seed(seed)
 
 
-def _run(func, args):
-    proc = Process(target=func, args=args)
+def _run(func, args, context=None):
+    if context is None:
+        context = get_context()
+
+    proc = context.Process(target=func, args=args)
     proc.daemon = True
     proc.start()
     return proc
 
 
+class _ThreadContext:
+    Queue = queue.Queue
+    Event = threading.Event
+    Process = threading.Thread
+
+
+def _get_context(backend, prefork):
+    if backend == "thread":
+        return _ThreadContext
+    if backend == "process":
+        return get_context("fork" if prefork else None)
+
+    raise RuntimeError(f"Unknown backend: {backend}")
+
+
 def _task_generator(seed):
     random_generator = random.Random(seed)
     task_idx = -1
@@ -102,29 +359,304 @@ def _task_generator(seed):
         yield task_idx, task_seed
 
 
-def _worker(path, name, config, task_queue, data_queue, retry, verbose):
-    template = read_template(path, name, config)
+def _stop_workers(procs, stop_event, task_queue, data_queue, slot_queue):
+    stop_event.set()
+    for _ in procs:
+        task_queue.put(None)
+
+    count = 0
+
+    while count < len(procs) and any(proc.is_alive() for proc in procs):
+        try:
+            item = data_queue.get(timeout=1)
+        except queue.Empty:
+            continue
+
+        if item is None or isinstance(item, _WorkerError):
+            count += 1
+            continue
+
+        for _, slot_idx, _, _, _ in item:
+            if slot_idx is not None:
+                slot_queue.put(slot_idx)
 
+    for proc in procs:
+        proc.join()
+
+
+def _get_results(data_queue, procs):
     while True:
-        task_idx, task_seed = task_queue.get()
-        data = _generate(template, task_seed, retry, verbose)
-        data_queue.put((task_idx, data))
+        try:
+            results = data_queue.get(timeout=1)
+        except queue.Empty:
+            if all(proc.is_alive() for proc in procs):
+                continue
+
+            try:
+                # error of a worker may arrive after it exits
+                results = data_queue.get(timeout=1)
+            except queue.Empty:
+                results = None
+            if not isinstance(results, _WorkerError):
+                raise RuntimeError("Worker exited unexpectedly")
+
+        if isinstance(results, _WorkerError):
+            raise RuntimeError(f"Worker {results.worker_idx} failed\n{results.message}")
+
+        return results
+
+
+def _chunk_generator(tasks, size):
+    while True:
+        chunk = list(itertools.islice(tasks, size))
+        if len(chunk) == 0:
+            break
+        yield chunk
+
+
+def _freeze_objects():
+    # move objects to the permanent generation so that garbage collection in
+    # workers does not write to their pages shared copy-on-write
+    if hasattr(gc, "freeze"):
+        gc.collect()
+        gc.freeze()
+
+
+def _worker(worker_idx, template, task_queue, data_queue, *args):
+    try:
+        _work(worker_idx, template, task_queue, data_queue, *args)
+    except Exception:
+        # errors are sent to the main process instead of leaving it waiting
+        data_queue.put(_WorkerError(worker_idx, traceback.format_exc()))
+        return
+
+    data_queue.put(None)
 
 
-def _generate(template, seed, retry, verbose):
-    states = get_global_random_states()
-    set_global_random_seed(seed)
+def _work(
+    worker_idx,
+    template,
+    task_queue,
+    data_queue,
+    retry,
+    max_retry,
+    timeout,
+    verbose,
+    global_random,
+    profiling,
+    stop_event,
+    slot_names,
+    slot_queue,
+    output,
+):
+    if isinstance(template, tuple):
+        template = read_template(*template)
+
+    slots = _attach_slots(slot_names)
+    if output is not None:
+        template.init_save(output, str(worker_idx))
+
+    while True:
+        chunk = task_queue.get()
+        if chunk is None:
+            break
+
+        results = []
+
+        for task_idx, task_seed in chunk:
+            if stop_event.is_set():
+                break
+
+            data, failures, records = _generate(
+                template,
+                task_seed,
+                retry,
+                max_retry,
+                timeout,
+                verbose,
+                global_random,
+                profiling,
+            )
+            if output is not None:
+                data = _save(template, output, data, task_idx)
+
+            slot_idx, data = _pack_data(data, slots, slot_queue)
+            results.append((task_idx, slot_idx, data, failures, records))
+
+        data_queue.put(results)
+
+    if output is not None:
+        template.end_save(output)
+
+
+class _WorkerError:
+    def __init__(self, worker_idx, message):
+        self.worker_idx = worker_idx
+        self.message = message
+
+
+def _save(template, root, data, idx):
+    if data is None:
+        return False
+
+    template.save(root, data, idx)
+    return True
+
+
+def _update_stats(stats, failures):
+    if stats is None:
+        return
+
+    for name, count in failures.items():
+        stats[name] = stats.get(name, 0) + count
+
+
+def _update_profile(profile, records):
+    if profile is None or records is None:
+        return
+
+    utils.merge_profile(profile, records)
+
+
+def _generate(
+    template,
+    seed,
+    retry,
+    max_retry,
+    timeout,
+    verbose,
+    global_random=True,
+    profiling=False,
+):
+    records = None
+    if global_random:
+        states = get_global_random_states()
+        set_global_random_seed(_derive_seed(seed))
+
+    with utils.random_context(seed):
+        if profiling:
+            with utils.profile_context() as profiler:
+                data, failures = _try_generate(
+                    template, retry, max_retry, timeout, verbose
+                )
+            records = profiler.records
+        else:
+            data, failures = _try_generate(template, retry, max_retry, timeout, verbose)
+
+    if global_random:
+        set_global_random_states(states)
+
+    return data, failures, records
+
+
+def _derive_seed(seed):
+    # independent seed, since random states seeded with the same seed repeat
+    # the same numbers
+    seq = np.random.SeedSequence(seed).spawn(1)[0]
+    seed = int.from_bytes(seq.generate_state(4).tobytes(), "little")
+    return seed
+
+
+def _try_generate(template, retry, max_retry, timeout, verbose):
     data = None
+    failures = {}
+    retries = 0
+    start_time = time.time()
 
     while True:
         try:
             data = template.generate()
-        except:
+        except Exception as e:
             if verbose:
                 print(f"{traceback.format_exc()}")
-            if retry:
+
+            name = type(e).__name__
+            failures[name] = failures.get(name, 0) + 1
+
+            exhausted = max_retry is not None and retries >= max_retry
+            expired = timeout is not None and time.time() - start_time >= timeout
+            if retry and not exhausted and not expired:
+                retries += 1
                 continue
         break
 
-    set_global_random_states(states)
+    return data, failures
+
+
+class _SharedArray:
+    def __init__(self, offset, shape, dtype):
+        self.offset = offset
+        self.shape = shape
+        self.dtype = dtype
+
+
+def _create_slots(count, size):
+    from multiprocessing.shared_memory import SharedMemory
+
+    slots = [SharedMemory(create=True, size=size) for _ in range(count)]
+    return slots
+
+
+def _attach_slots(names):
+    if len(names) == 0:
+        return []
+
+    from multiprocessing.shared_memory import SharedMemory
+
+    slots = [SharedMemory(name=name) for name in names]
+    return slots
+
+
+def _release_slots(slots):
+    for slot in slots:
+        try:
+            slot.close()
+        except BufferError:
+            # arrays of the last data may still be referenced
+            pass
+        slot.unlink()
+
+
+def _pack_data(data, slots, slot_queue):
+    if len(slots) == 0 or not isinstance(data, dict):
+        return None, data
+
+    arrays = {
+        key: value for key, value in data.items() if isinstance(value, np.ndarray)
+    }
+    sizes = [_align_size(array.nbytes) for array in arrays.values()]
+    if len(arrays) == 0 or sum(sizes) > slots[0].size:
+        return None, data
+
+    slot_idx = slot_queue.get()
+    buffer = slots[slot_idx].buf
+    data = dict(data)
+    offset = 0
+
+    for (key, array), size in zip(arrays.items(), sizes):
+        view = np.ndarray(array.shape, dtype=array.dtype, buffer=buffer, offset=offset)
+        view[...] = array
+        data[key] = _SharedArray(offset, array.shape, array.dtype.str)
+        offset += size
+
+    return slot_idx, data
+
+
+def _unpack_data(data, slots, slot_idx):
+    if slot_idx is None:
+        return data
+
+    buffer = slots[slot_idx].buf
+    data = dict(data)
+
+    for key, value in data.items():
+        if isinstance(value, _SharedArray):
+            data[key] = np.ndarray(
+                value.shape, dtype=value.dtype, buffer=buffer, offset=value.offset
+            )
+
     return data
+
+
+def _align_size(size, alignment=64):
+    return (size + alignment - 1) // alignment * alignment
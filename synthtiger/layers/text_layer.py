@@ -5,13 +5,18 @@ MIT license
 """
 
 import numpy as np
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw
 
 from synthtiger import utils
 from synthtiger.layers.layer import Layer
 
 
 class TextLayer(Layer):
+    # rendered images and bboxes of texts, shared by text layers in a process
+    glyph_cache = utils.LRUCache(2**26, size_func=lambda value: value[0].nbytes)
+    # whether glyphs are read from atlases next to fonts, if present
+    glyph_atlas = True
+
     def __init__(
         self,
         text,
@@ -20,18 +25,90 @@ class TextLayer(Layer):
         color=(0, 0, 0, 255),
         bold=False,
         vertical=False,
+        backend="pil",
     ):
+        if backend not in ("pil", "pygame"):
+            raise RuntimeError(f"Unknown backend: {backend}")
+
         # https://en.wikipedia.org/wiki/Backslash
         text = text.replace("\\", "＼")
+        self.backend = backend
+
+        key = (path, size, text, tuple(color), bold, vertical, backend)
+        glyph = self.glyph_cache.get(key)
 
-        font = self._read_font(path, size)
-        image, bbox = self._render_text(text, font, color, bold, vertical)
+        if glyph is None:
+            glyph = self._read_atlas(text, path, size, color, bold, vertical)
 
+        if glyph is None:
+            font = self._read_font(path, size)
+            image, bbox = self._render_text(text, font, color, bold, vertical)
+            glyph = (_compact_image(image), tuple(bbox))
+            self.glyph_cache.put(key, glyph)
+
+        image, bbox = glyph
         super().__init__(image)
         self.bbox = bbox
 
+    @classmethod
+    def from_chars(
+        cls,
+        chars,
+        path,
+        size,
+        color=(0, 0, 0, 255),
+        bold=False,
+        vertical=False,
+        backend="pil",
+    ):
+        args = (path, size, color, bold, vertical, backend)
+
+        # horizontal text is rendered at once and split at advances of chars
+        if vertical:
+            return [cls(char, *args) for char in chars]
+
+        # https://en.wikipedia.org/wiki/Backslash
+        chars = [char.replace("\\", "＼") for char in chars]
+
+        text_layer = cls("".join(chars), *args)
+        font = utils.read_font(path, size)
+        text_width = text_layer.image.shape[1]
+
+        offsets = [0]
+        for idx in range(1, len(chars)):
+            offset = round(font.getlength("".join(chars[:idx])))
+            offsets.append(min(offset, text_width))
+        offsets.append(text_width)
+
+        if any(left > right for left, right in zip(offsets, offsets[1:])):
+            return [cls(char, *args) for char in chars]
+
+        _, top, _, height = text_layer.bbox
+        char_layers = []
+
+        for left, right in zip(offsets, offsets[1:]):
+            char_layer = Layer(text_layer.image[:, left:right])
+            char_layer.bbox = [0, top, right - left, height]
+            char_layers.append(char_layer)
+
+        return char_layers
+
+    def _read_atlas(self, text, path, size, color, bold, vertical):
+        if not self.glyph_atlas or self.backend != "pil":
+            return None
+
+        atlas = utils.read_glyph_atlas(path)
+        glyph = atlas.get(text, size, bold, vertical) if atlas is not None else None
+        if glyph is None:
+            return None
+
+        mask, bbox = glyph
+        image = _fill_mask(mask, color)
+
+        return image, bbox
+
     def _read_font(self, path, size):
-        font = ImageFont.truetype(path, size=size)
+        font = utils.read_font(path, size)
         return font
 
     def _render_text(self, text, font, color, bold, vertical):
@@ -153,6 +230,11 @@ class TextLayer(Layer):
         bbox = self._get_bbox(text, font, vertical)
         width, height = bbox[2:]
 
+        # vertical layout and strong style of pygame differ from those of PIL
+        if self.backend == "pygame" and not vertical and stroke_width == 0:
+            image = self._get_pygame_image(text, font, color, bbox)
+            return image, bbox
+
         image = Image.new("RGBA", (width, height))
         draw = ImageDraw.Draw(image)
         draw.text(
@@ -167,6 +249,21 @@ class TextLayer(Layer):
 
         return image, bbox
 
+    def _get_pygame_image(self, text, font, color, bbox):
+        from pygame import freetype
+
+        pygame_font = utils.read_pygame_font(font.path, font.size)
+        style = freetype.STYLE_DEFAULT
+        data, (mask_width, mask_height) = pygame_font.render_raw(text, style=style)
+        mask = np.frombuffer(data, dtype=np.uint8).reshape(mask_height, mask_width)
+
+        width, height = bbox[2:]
+        image = np.zeros((height, width, 4), dtype=np.float32)
+        mask = mask[:height, :width]
+        image[: mask.shape[0], : mask.shape[1]] = _fill_mask(mask, color)
+
+        return image
+
     def _get_bbox(self, text, font, vertical):
         direction = self._get_direction(vertical)
 
@@ -206,3 +303,27 @@ class TextLayer(Layer):
     def _get_direction(self, vertical):
         direction = "ltr" if not vertical else "ttb"
         return direction
+
+
+def _fill_mask(mask, color):
+    # same as drawing with color on transparent image of PIL, which keeps the
+    # color of partially covered pixels and blends only their alpha
+    color = np.array(color, dtype=np.int32)
+    mask = mask.astype(np.int32)
+    value = mask * color[3] + 128
+
+    image = np.zeros((*mask.shape, 4), dtype=np.float32)
+    image[mask > 0, :3] = color[:3]
+    image[..., 3] = (value + (value >> 8)) >> 8
+
+    return image
+
+
+def _compact_image(image):
+    # rendered images have integer values, so they are kept in uint8 if lossless
+    compact_image = image.astype(np.uint8)
+    if not np.array_equal(compact_image, image):
+        compact_image = np.array(image)
+
+    compact_image.flags.writeable = False
+    return compact_image
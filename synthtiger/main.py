@@ -5,20 +5,88 @@ MIT license
 """
 
 import argparse
+import os
 import pprint
+import re
 import time
 
+import numpy as np
+
 import synthtiger
 
 
+class _Manifest:
+    def __init__(self, path):
+        self._bits = bytearray()
+        if os.path.exists(path):
+            with open(path, "rb") as fp:
+                self._bits = bytearray(fp.read())
+        self._file = open(path, "r+b" if os.path.exists(path) else "wb", buffering=0)
+
+    def __contains__(self, idx):
+        pos, bit = divmod(idx, 8)
+        return pos < len(self._bits) and bool(self._bits[pos] >> bit & 1)
+
+    def __len__(self):
+        bits = np.unpackbits(np.frombuffer(bytes(self._bits), dtype=np.uint8))
+        return int(np.sum(bits))
+
+    def add(self, idx):
+        pos, bit = divmod(idx, 8)
+        if pos >= len(self._bits):
+            self._bits.extend(bytes(pos + 1 - len(self._bits)))
+
+        self._bits[pos] |= 1 << bit
+        self._file.seek(pos)
+        self._file.write(self._bits[pos : pos + 1])
+
+    def sync(self):
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        self._file.close()
+
+
+def _remove_parts(root):
+    # part files of an interrupted generation have data of unrecorded tasks
+    for file_name in os.listdir(root):
+        if re.fullmatch(r"(.+)\.(\d+)\.txt", file_name):
+            os.remove(os.path.join(root, file_name))
+
+
+def _commit(root, manifest, task_idxes):
+    # tasks are recorded only after their part files are merged and synced
+    for path in synthtiger.merge_parts(root, append=True):
+        with open(path, "rb") as fp:
+            os.fsync(fp.fileno())
+
+    for task_idx in task_idxes:
+        manifest.add(task_idx)
+    manifest.sync()
+    task_idxes.clear()
+
+
 def run(args):
     if args.config is not None:
         config = synthtiger.read_config(args.config)
 
     pprint.pprint(config)
 
+    if args.resume and args.output is None:
+        raise RuntimeError("Output directory is required to resume generation")
+
+    manifest = None
+
+    if args.resume:
+        os.makedirs(args.output, exist_ok=True)
+        _remove_parts(args.output)
+        manifest = _Manifest(os.path.join(args.output, "manifest.bin"))
+        print(f"Resumed {len(manifest)} data")
+
     synthtiger.set_global_random_seed(args.seed)
-    template = synthtiger.read_template(args.script, args.name, config)
+    save = args.output is not None and not args.worker_save
+    stats = {}
+    profile = {} if args.profile else None
     generator = synthtiger.generator(
         args.script,
         args.name,
@@ -28,19 +96,77 @@ def run(args):
         seed=args.seed,
         retry=True,
         verbose=args.verbose,
+        shared_memory=args.shared_memory,
+        output=args.output if args.worker_save else None,
+        chunk_size=args.chunk_size,
+        prefetch=args.prefetch,
+        skip=manifest,
+        shard=args.shard,
+        max_retry=args.max_retry,
+        timeout=args.timeout,
+        stats=stats,
+        prefork=args.prefork,
+        backend=args.backend,
+        global_random=not args.local_random,
+        profile=profile,
     )
 
-    if args.output is not None:
-        template.init_save(args.output)
+    if save:
+        template = synthtiger.read_template(args.script, args.name, config)
+        if args.resume:
+            template.init_save(args.output, "0")
+        else:
+            template.init_save(args.output)
+
+    count = 0
+    task_idxes = []
+
+    for task_idx, data in generator:
+        if data is None or data is False:
+            print(f"Failed to generate data (task {task_idx})")
+            continue
 
-    for idx, (task_idx, data) in enumerate(generator):
-        if args.output is not None:
+        if save:
             template.save(args.output, data, task_idx)
-        print(f"Generated {idx + 1} data (task {task_idx})")
+        if manifest is not None:
+            task_idxes.append(task_idx)
+        count += 1
+        print(f"Generated {count} data (task {task_idx})")
 
-    if args.output is not None:
+        # data saved by workers is recorded after they finish
+        if save and manifest is not None and len(task_idxes) >= args.checkpoint:
+            template.end_save(args.output)
+            _commit(args.output, manifest, task_idxes)
+            template.init_save(args.output, "0")
+
+    if save:
         template.end_save(args.output)
 
+    if args.resume:
+        _commit(args.output, manifest, task_idxes)
+        manifest.close()
+    elif args.output is not None and args.worker_save and args.merge:
+        paths = synthtiger.merge_parts(args.output)
+        print(f"Merged {len(paths)} files")
+
+    for name, failure in sorted(stats.items(), key=lambda item: -item[1]):
+        print(f"Failed {failure} times ({name})")
+
+    if profile is not None:
+        print(synthtiger.utils.format_profile(profile))
+
+
+def parse_shard(text):
+    try:
+        idx, count = map(int, text.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid shard: '{text}'")
+
+    if not 0 <= idx < count:
+        raise argparse.ArgumentTypeError(f"shard index is out of range: '{text}'")
+
+    return idx, count
+
 
 def parse_args():
     parser = argparse.ArgumentParser()
@@ -67,6 +193,20 @@ def parse_args():
         default=0,
         help="Number of workers. If 0, It generates data in the main process. [default: 0]",
     )
+    parser.add_argument(
+        "--chunk_size",
+        metavar="NUM",
+        type=int,
+        default=1,
+        help="Number of tasks sent to a worker at once. [default: 1]",
+    )
+    parser.add_argument(
+        "--prefetch",
+        metavar="NUM",
+        type=int,
+        default=0,
+        help="Number of chunks dispatched in addition to one per worker. [default: 0]",
+    )
     parser.add_argument(
         "-s",
         "--seed",
@@ -75,6 +215,84 @@ def parse_args():
         default=None,
         help="Random seed. [default: None]",
     )
+    parser.add_argument(
+        "--shard",
+        metavar="I/N",
+        type=parse_shard,
+        default=None,
+        help="Generate only tasks whose indices are I modulo N. [default: None]",
+    )
+    parser.add_argument(
+        "--shared_memory",
+        action="store_true",
+        default=False,
+        help="Transfer generated arrays from workers through shared memory.",
+    )
+    parser.add_argument(
+        "--prefork",
+        action="store_true",
+        default=False,
+        help="Read template once and share it with forked workers.",
+    )
+    parser.add_argument(
+        "--backend",
+        metavar="NAME",
+        type=str,
+        default="process",
+        choices=["process", "thread"],
+        help="Type of workers. (process, thread) [default: process]",
+    )
+    parser.add_argument(
+        "--local_random",
+        action="store_true",
+        default=False,
+        help="Seed only random states of tasks, not global random states.",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        default=False,
+        help="Print time spent in templates and components after generation.",
+    )
+    parser.add_argument(
+        "--worker_save",
+        action="store_true",
+        default=False,
+        help="Save data in workers into part files. (e.g. gt.0.txt)",
+    )
+    parser.add_argument(
+        "--merge",
+        action="store_true",
+        default=False,
+        help="Merge part files saved in workers after generation.",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        default=False,
+        help="Record generated tasks in output directory and skip them when resumed.",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        metavar="NUM",
+        type=int,
+        default=1000,
+        help="Number of data saved in main process between records of resumed generation. [default: 1000]",
+    )
+    parser.add_argument(
+        "--max_retry",
+        metavar="NUM",
+        type=int,
+        default=None,
+        help="Maximum number of retries for a failed task. [default: None]",
+    )
+    parser.add_argument(
+        "--timeout",
+        metavar="SEC",
+        type=float,
+        default=None,
+        help="Seconds after which a failed task is not retried. [default: None]",
+    )
     parser.add_argument(
         "-v",
         "--verbose",
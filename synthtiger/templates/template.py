@@ -6,17 +6,24 @@ MIT license
 
 from abc import ABC, abstractmethod
 
+from synthtiger.utils.profile_util import profile_method
+
 
 class Template(ABC):
     def __init__(self, config=None):
         pass
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if "generate" in cls.__dict__:
+            cls.generate = profile_method(cls.__dict__["generate"])
+
     @abstractmethod
     def generate(self):
         pass
 
     @abstractmethod
-    def init_save(self, root):
+    def init_save(self, root, part=None):
         pass
 
     @abstractmethod
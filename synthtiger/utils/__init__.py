@@ -4,7 +4,27 @@ Copyright (c) 2021-present NAVER Corp.
 MIT license
 """
 
-from synthtiger.utils.file_util import read_charset, search_files
+from synthtiger.utils.cache_util import LRUCache
+from synthtiger.utils.corpus_util import (
+    is_corpus_file,
+    read_corpus_file,
+    write_corpus_file,
+)
+from synthtiger.utils.file_util import (
+    read_charset,
+    read_manifest,
+    search_files,
+    write_manifest,
+)
+from synthtiger.utils.font_util import (
+    GlyphAtlas,
+    font_cache,
+    read_font,
+    read_glyph_atlas,
+    read_pygame_font,
+    set_max_fonts,
+    write_glyph_atlas,
+)
 from synthtiger.utils.image_util import (
     add_alpha_channel,
     blend_image,
@@ -26,6 +46,25 @@ from synthtiger.utils.image_util import (
     to_quad,
     to_rgb,
 )
+from synthtiger.utils.profile_util import (
+    Profiler,
+    format_profile,
+    get_profiler,
+    merge_profile,
+    profile_block,
+    profile_context,
+    profile_method,
+)
+from synthtiger.utils.random_util import (
+    AliasSampler,
+    RandomContext,
+    get_generator,
+    get_imgaug_rng,
+    get_python_random,
+    get_random_context,
+    get_random_state,
+    random_context,
+)
 from synthtiger.utils.unicode_util import (
     reorder_text,
     reshape_text,
@@ -0,0 +1,90 @@
+"""
+SynthTIGER
+Copyright (c) 2021-present NAVER Corp.
+MIT license
+"""
+
+import collections
+import sys
+import threading
+
+
+class LRUCache:
+    """
+    Cache evicting least recently used values over a size limit.
+
+    :param max_size: The maximum total size of values, disabled if 0
+    :type max_size: int
+    :param size_func: The function returning the size of a value, sys.getsizeof
+        if None
+    :type size_func: function, optional
+    """
+
+    def __init__(self, max_size, size_func=None):
+        self.max_size = max_size
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._size_func = size_func if size_func is not None else sys.getsizeof
+        self._items = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._items:
+                self.misses += 1
+                return default
+
+            self._items.move_to_end(key)
+            self.hits += 1
+            value, _ = self._items[key]
+
+        return value
+
+    def put(self, key, value):
+        size = self._size_func(value)
+
+        with self._lock:
+            if key in self._items:
+                _, old_size = self._items.pop(key)
+                self.size -= old_size
+
+            if size > self.max_size:
+                return
+
+            self._items[key] = (value, size)
+            self.size += size
+            self._evict()
+
+    def resize(self, max_size):
+        with self._lock:
+            self.max_size = max_size
+            self._evict()
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.size = 0
+
+    def stats(self):
+        stats = {
+            "count": len(self._items),
+            "size": self.size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+        return stats
+
+    def _evict(self):
+        while self.size > self.max_size:
+            _, (_, size) = self._items.popitem(last=False)
+            self.size -= size
+            self.evictions += 1
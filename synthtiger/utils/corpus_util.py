@@ -0,0 +1,86 @@
+"""
+SynthTIGER
+Copyright (c) 2021-present NAVER Corp.
+MIT license
+"""
+
+import array
+import json
+import os
+
+import numpy as np
+
+CORPUS_EXT = ".corpus"
+
+
+def is_corpus_file(path):
+    """
+    Check whether a path is a binary corpus file.
+
+    :param path: The corpus path
+    :type path: str
+    :return: Whether the path is a binary corpus file
+    :rtype: bool
+    """
+
+    return os.path.splitext(path)[1].lower() == CORPUS_EXT
+
+
+def read_corpus_file(path):
+    """
+    Read a binary corpus file, memory-mapped.
+
+    A binary corpus consists of three files: ``.corpus`` containing texts
+    encoded in UTF-8 back to back, ``.corpus.idx`` containing uint64 byte
+    offsets of texts as npy, and ``.corpus.json`` containing the filters
+    applied to the texts.
+
+    :param path: The corpus file path
+    :type path: str
+    :return: The contents, offsets and meta of the corpus
+    :rtype: tuple
+    """
+
+    contents = np.zeros(0, dtype=np.uint8)
+    if os.path.getsize(path) > 0:
+        contents = np.memmap(path, dtype=np.uint8, mode="r")
+
+    # offsets are never empty, since they start with 0
+    offsets = np.load(f"{path}.idx", mmap_mode="r")
+
+    with open(f"{path}.json", "r", encoding="utf-8") as fp:
+        meta = json.load(fp)
+
+    return contents, offsets, meta
+
+
+def write_corpus_file(path, texts, meta=None):
+    """
+    Write a binary corpus file.
+
+    :param path: The corpus file path
+    :type path: str
+    :param texts: The texts
+    :type texts: iterable
+    :param meta: The filters applied to the texts
+    :type meta: dict, optional
+    :return: The number of written texts
+    :rtype: int
+    """
+
+    offsets = array.array("Q", [0])
+
+    with open(path, "wb") as fp:
+        for text in texts:
+            data = text.encode("utf-8")
+            fp.write(data)
+            offsets.append(offsets[-1] + len(data))
+
+    with open(f"{path}.idx", "wb") as fp:
+        np.save(fp, np.frombuffer(offsets, dtype=np.uint64))
+
+    meta = dict(meta or {}, count=len(offsets) - 1, encoding="utf-8")
+    with open(f"{path}.json", "w", encoding="utf-8") as fp:
+        json.dump(meta, fp, ensure_ascii=False)
+
+    return len(offsets) - 1
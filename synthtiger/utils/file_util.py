@@ -4,10 +4,58 @@ Copyright (c) 2021-present NAVER Corp.
 MIT license
 """
 
+import hashlib
+import json
 import os
+from typing import Dict, Tuple
 
+from PIL import Image
+
+MANIFEST_NAME = ".synthtiger_manifest.json"
+IMAGE_EXTS = [".jpg", ".jpeg", ".png", ".bmp"]
+
+# manifests read in a process, keyed by root
+_manifests: Dict[str, Tuple[int, dict]] = {}
+
+
+def search_files(root, names=None, exts=None, manifest=False):
+    """
+    Search files in a directory recursively.
+
+    Files are listed from the manifest of the directory if it is valid.
+
+    :param root: The directory path
+    :type root: str
+    :param names: The file names to search, all if None
+    :type names: list, optional
+    :param exts: The lowercase file extensions to search, all if None
+    :type exts: list, optional
+    :param manifest: Whether to write the manifest if it is missing or stale
+    :type manifest: bool, optional
+    :return: The file paths
+    :rtype: list
+    """
+
+    files = read_manifest(root)
+    if files is None and manifest:
+        files = write_manifest(root)
+
+    if files is not None:
+        paths = []
+
+        for file in files:
+            file_name = os.path.basename(file["path"])
+            file_ext = os.path.splitext(file_name)[1]
+
+            if names is not None and file_name not in names:
+                continue
+            if exts is not None and file_ext.lower() not in exts:
+                continue
+
+            paths.append(file["path"])
+
+        return paths
 
-def search_files(root, names=None, exts=None):
     paths = []
 
     for dir_path, _, file_names in os.walk(root):
@@ -25,7 +73,128 @@ def search_files(root, names=None, exts=None):
     return paths
 
 
+def read_manifest(root):
+    """
+    Read the manifest of a directory, or None if it is missing or stale.
+
+    A manifest is stale if any directory in it has been modified since it was
+    written, which happens when files are added, removed or renamed. Entries
+    of the directory itself are compared instead, since writing the manifest
+    modifies it. Files rewritten in place are not detected.
+
+    :param root: The directory path
+    :type root: str
+    :return: The files, as dicts with keys path, size, mtime, width, height
+        and orientation
+    :rtype: list, optional
+    """
+
+    manifest_path = os.path.join(root, MANIFEST_NAME)
+
+    try:
+        mtime = os.stat(manifest_path).st_mtime_ns
+        key = os.path.abspath(root)
+
+        if key not in _manifests or _manifests[key][0] != mtime:
+            with open(manifest_path, "r", encoding="utf-8") as fp:
+                _manifests[key] = (mtime, json.load(fp))
+
+        manifest = _manifests[key][1]
+        if _get_entries_key(root) != manifest["root"]:
+            return None
+        for dir_path, dir_mtime in manifest["dirs"].items():
+            if os.stat(os.path.join(root, dir_path)).st_mtime_ns != dir_mtime:
+                return None
+    except (OSError, ValueError, KeyError):
+        return None
+
+    columns = manifest["columns"]
+    files = [dict(zip(columns, row)) for row in manifest["files"]]
+    for file in files:
+        file["path"] = os.path.join(root, file["path"])
+
+    return files
+
+
+def write_manifest(root, image=True):
+    """
+    Write the manifest of a directory.
+
+    The manifest lists all files in the directory recursively with their
+    sizes and mtimes, and image sizes and EXIF orientations of images.
+    Errors while writing the manifest file are ignored.
+
+    :param root: The directory path
+    :type root: str
+    :param image: Whether to read sizes and orientations of images
+    :type image: bool, optional
+    :return: The files, as dicts with keys path, size, mtime, width, height
+        and orientation
+    :rtype: list
+    """
+
+    columns = ["path", "size", "mtime", "width", "height", "orientation"]
+    dirs = {}
+    rows = []
+
+    for dir_path, _, file_names in os.walk(root):
+        if dir_path != root:
+            dirs[os.path.relpath(dir_path, root)] = os.stat(dir_path).st_mtime_ns
+
+        for file_name in file_names:
+            if file_name.startswith(MANIFEST_NAME):
+                continue
+
+            file_path = os.path.join(dir_path, file_name)
+            file_ext = os.path.splitext(file_name)[1]
+            stat = os.stat(file_path)
+            width, height, orientation = None, None, None
+
+            if image and file_ext.lower() in IMAGE_EXTS:
+                try:
+                    width, height, orientation = _read_image_info(file_path)
+                except OSError:
+                    pass
+
+            rel_path = os.path.relpath(file_path, root)
+            rows.append([rel_path, stat.st_size, stat.st_mtime_ns])
+            rows[-1] += [width, height, orientation]
+
+    root_key = _get_entries_key(root)
+    manifest = {"columns": columns, "root": root_key, "dirs": dirs, "files": rows}
+    manifest_path = os.path.join(root, MANIFEST_NAME)
+    tmp_path = f"{manifest_path}.{os.getpid()}.tmp"
+
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as fp:
+            json.dump(manifest, fp, ensure_ascii=False)
+        os.replace(tmp_path, manifest_path)
+        _manifests.pop(os.path.abspath(root), None)
+    except OSError:
+        pass
+
+    files = [dict(zip(columns, row)) for row in rows]
+    for file in files:
+        file["path"] = os.path.join(root, file["path"])
+
+    return files
+
+
 def read_charset(path):
     with open(path, "r", encoding="utf-8") as fp:
         charset = set(fp.read())
     return charset
+
+
+def _get_entries_key(root):
+    # entries except manifests, whose temporary files are created concurrently
+    names = [name for name in os.listdir(root) if not name.startswith(MANIFEST_NAME)]
+    key = hashlib.sha1("\n".join(sorted(names)).encode("utf-8")).hexdigest()
+    return key
+
+
+def _read_image_info(path):
+    with Image.open(path) as image:
+        width, height = image.size
+        orientation = dict(image.getexif()).get(0x0112, 1)
+    return width, height, orientation
@@ -0,0 +1,212 @@
+"""
+SynthTIGER
+Copyright (c) 2021-present NAVER Corp.
+MIT license
+"""
+
+import json
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from PIL import ImageFont
+
+from synthtiger.utils.cache_util import LRUCache
+
+# loaded fonts shared by text rendering in a process, limited by count
+font_cache = LRUCache(256, size_func=lambda value: 1)
+
+# stats and glyph atlases of font paths, None if not present
+_atlases: Dict[str, Tuple[List[int], Optional["GlyphAtlas"]]] = {}
+
+
+class GlyphAtlas:
+    """
+    Glyph masks of a font stored in a memory-mapped file.
+
+    The atlas of a font consists of two files next to the font, ``.atlas``
+    containing the masks and ``.atlas.json`` containing their offsets, shapes
+    and bboxes, and the mtime and size of the font. Masks are alpha channels of
+    texts rendered in opaque black.
+
+    :param path: The atlas file path
+    :type path: str
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+        with open(f"{path}.json", "r", encoding="utf-8") as fp:
+            data = json.load(fp)
+        self.font = data.get("font")
+        self._index = data["glyphs"]
+
+        self._data = np.zeros(0, dtype=np.uint8)
+        if os.path.getsize(path) > 0:
+            self._data = np.memmap(path, dtype=np.uint8, mode="r")
+
+    def __len__(self):
+        return len(self._index)
+
+    def get(self, text, size, bold, vertical):
+        """
+        Get the mask and bbox of a text, or None if not in atlas.
+
+        The mask is a read-only view of the memory-mapped file.
+
+        :param text: The text
+        :type text: str
+        :param size: The font size
+        :type size: int
+        :param bold: Whether the text is bold
+        :type bold: bool
+        :param vertical: Whether the text is vertical
+        :type vertical: bool
+        :return: The mask and bbox
+        :rtype: tuple, optional
+        """
+
+        item = self._index.get(_get_glyph_key(text, size, bold, vertical))
+        if item is None:
+            return None
+
+        offset, height, width, *bbox = item
+        mask = self._data[offset : offset + height * width].reshape(height, width)
+        return mask, bbox
+
+
+def read_glyph_atlas(path):
+    """
+    Read the glyph atlas of a font, or None if not present or written for
+    another version of the font.
+
+    :param path: The font file path
+    :type path: str
+    :return: The glyph atlas
+    :rtype: GlyphAtlas, optional
+    """
+
+    stat = _get_font_stat(path)
+
+    if path not in _atlases or _atlases[path][0] != stat:
+        atlas_path = f"{os.path.splitext(path)[0]}.atlas"
+        atlas = None
+        if os.path.exists(atlas_path) and os.path.exists(f"{atlas_path}.json"):
+            atlas = GlyphAtlas(atlas_path)
+            # atlases of replaced fonts are ignored
+            if atlas.font != stat:
+                atlas = None
+        _atlases[path] = (stat, atlas)
+
+    return _atlases[path][1]
+
+
+def write_glyph_atlas(path, glyphs):
+    """
+    Write the glyph atlas of a font.
+
+    :param path: The font file path
+    :type path: str
+    :param glyphs: The glyphs, as tuples (text, size, bold, vertical, mask, bbox)
+    :type glyphs: iterable
+    :return: The number of written glyphs
+    :rtype: int
+    """
+
+    atlas_path = f"{os.path.splitext(path)[0]}.atlas"
+    index = {}
+    offset = 0
+
+    with open(atlas_path, "wb") as fp:
+        for text, size, bold, vertical, mask, bbox in glyphs:
+            mask = np.ascontiguousarray(mask, dtype=np.uint8)
+            height, width = mask.shape
+            key = _get_glyph_key(text, size, bold, vertical)
+            index[key] = [offset, height, width, *[int(value) for value in bbox]]
+            fp.write(mask.tobytes())
+            offset += mask.size
+
+    meta = {"font": _get_font_stat(path), "glyphs": index}
+    with open(f"{atlas_path}.json", "w", encoding="utf-8") as fp:
+        json.dump(meta, fp, ensure_ascii=False)
+
+    _atlases.pop(path, None)
+    return len(index)
+
+
+def read_font(path, size, layout_engine=None):
+    """
+    Read a font from cache, or load it if not cached.
+
+    Fonts are cached per thread, since FreeType faces can not be used by
+    threads concurrently.
+
+    :param path: The font file path
+    :type path: str
+    :param size: The font size
+    :type size: int
+    :param layout_engine: The layout engine of PIL, default if None
+    :type layout_engine: int, optional
+    :return: The loaded font
+    :rtype: PIL.ImageFont.FreeTypeFont
+    """
+
+    key = (path, size, layout_engine, threading.get_ident())
+    font = font_cache.get(key)
+
+    if font is None:
+        font = ImageFont.truetype(path, size=size, layout_engine=layout_engine)
+        font_cache.put(key, font)
+
+    return font
+
+
+def read_pygame_font(path, size):
+    """
+    Read a font of pygame.freetype from cache, or load it if not cached.
+
+    :param path: The font file path
+    :type path: str
+    :param size: The font size
+    :type size: int
+    :return: The loaded font
+    :rtype: pygame.freetype.Font
+    """
+
+    key = (path, size, "pygame", threading.get_ident())
+    font = font_cache.get(key)
+
+    if font is None:
+        from pygame import freetype
+
+        if not freetype.get_init():
+            freetype.init()
+
+        font = freetype.Font(path, size=size)
+        font.antialiased = True
+        font.pad = True
+        font_cache.put(key, font)
+
+    return font
+
+
+def set_max_fonts(max_fonts):
+    """
+    Set the maximum number of cached fonts.
+
+    :param max_fonts: The maximum number of fonts, disabled if 0
+    :type max_fonts: int
+    """
+
+    font_cache.resize(max_fonts)
+
+
+def _get_glyph_key(text, size, bold, vertical):
+    key = f"{int(size)} {int(bold)} {int(vertical)} {text}"
+    return key
+
+
+def _get_font_stat(path):
+    stat = os.stat(path)
+    return [stat.st_mtime_ns, stat.st_size]
@@ -9,6 +9,8 @@ import cv2
 import numpy as np
 from PIL import Image
 
+from synthtiger.utils.random_util import get_random_state
+
 
 def create_image(size, color=None):
     """
@@ -260,10 +262,11 @@ def to_gray(color):
 
 
 def to_rgb(gray, colorize=False):
+    random_state = get_random_state()
     rgb = (gray, gray, gray)
 
     if colorize:
-        indices = np.random.permutation(256 * 256)
+        indices = random_state.permutation(256 * 256)
         for idx in indices:
             r = int(idx // 256)
             g = int(idx % 256)
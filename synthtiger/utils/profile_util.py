@@ -0,0 +1,244 @@
+"""
+SynthTIGER
+Copyright (c) 2021-present NAVER Corp.
+MIT license
+"""
+
+import contextlib
+import functools
+import threading
+import time
+
+import numpy as np
+
+_local = threading.local()
+
+
+class Profiler:
+    """
+    Records of wall time, call counts and output pixels.
+
+    Records are keyed by the call path of ``(label, class name)`` pairs, so
+    that calls of components inside wrappers are attributed to the wrappers.
+    Components reachable from the attributes of the first called object (e.g.
+    a template) are labeled with their attribute paths, such as
+    ``style.component.components.0``.
+    """
+
+    def __init__(self):
+        self.records = {}
+        self._names = {}
+        self._roots = set()
+        self._stack = []
+
+    def register(self, obj, prefix=""):
+        from synthtiger.components.component import Component
+
+        for attr, value in vars(obj).items():
+            values = value if isinstance(value, (list, tuple)) else [value]
+
+            for idx, item in enumerate(values):
+                if not isinstance(item, Component) or id(item) in self._names:
+                    continue
+
+                name = f"{prefix}{attr}"
+                if isinstance(value, (list, tuple)):
+                    name = f"{name}.{idx}"
+
+                self._names[id(item)] = name
+                self.register(item, f"{name}.")
+
+    def call(self, func, obj, args, kwargs):
+        method = func.__name__
+        frame = (id(obj), method)
+
+        # methods of base classes called through super()
+        if len(self._stack) > 0 and self._stack[-1][0] == frame:
+            return func(obj, *args, **kwargs)
+
+        if len(self._stack) == 0 and id(obj) not in self._roots:
+            self._roots.add(id(obj))
+            self.register(obj)
+
+        cls = type(obj).__name__
+        name = self._names.get(id(obj), cls)
+        output = None
+
+        with self._record(frame, f"{name}.{method}", cls) as record:
+            output = func(obj, *args, **kwargs)
+            pixels = output
+            if method == "apply":
+                pixels = args[0] if len(args) > 0 else kwargs["layers"]
+            record[2] = _count_pixels(pixels)
+
+        return output
+
+    def block(self, name):
+        return self._record(None, name, "")
+
+    @contextlib.contextmanager
+    def _record(self, frame, label, cls):
+        parent = self._stack[-1][1] if len(self._stack) > 0 else ()
+        key = parent + ((label, cls),)
+        record = [1, 0, 0]
+
+        self._stack.append((frame, key))
+        start_time = time.perf_counter()
+
+        try:
+            yield record
+        finally:
+            record[1] = time.perf_counter() - start_time
+            self._stack.pop()
+            merge_profile(self.records, {key: record})
+
+
+@contextlib.contextmanager
+def profile_context(profiler=None):
+    """
+    Record calls of components and templates in the current thread.
+
+    :param profiler: The profiler to record calls, new one if None
+    :type profiler: Profiler, optional
+    :return: The profiler
+    :rtype: Profiler
+    """
+
+    if profiler is None:
+        profiler = Profiler()
+
+    prev_profiler = getattr(_local, "profiler", None)
+    _local.profiler = profiler
+
+    try:
+        yield profiler
+    finally:
+        _local.profiler = prev_profiler
+
+
+def get_profiler():
+    profiler = getattr(_local, "profiler", None)
+    return profiler
+
+
+@contextlib.contextmanager
+def profile_block(name):
+    """
+    Record a block of code as a call named name if profiling.
+
+    :param name: The name of the block
+    :type name: str
+    """
+
+    profiler = get_profiler()
+    if profiler is None:
+        yield
+        return
+
+    with profiler.block(name):
+        yield
+
+
+def profile_method(func):
+    """
+    Decorate a method to be recorded if profiling.
+
+    :param func: The method
+    :type func: function
+    :return: The decorated method
+    :rtype: function
+    """
+
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        profiler = get_profiler()
+        if profiler is None:
+            return func(self, *args, **kwargs)
+        return profiler.call(func, self, args, kwargs)
+
+    return wrapper
+
+
+def merge_profile(records, other_records):
+    """
+    Add records of a profiler to other records.
+
+    :param records: The records to add to
+    :type records: dict
+    :param other_records: The records to add
+    :type other_records: dict
+    """
+
+    for key, (count, seconds, pixels) in other_records.items():
+        record = records.setdefault(key, [0, 0, 0])
+        record[0] += count
+        record[1] += seconds
+        record[2] += pixels
+
+
+def format_profile(records):
+    """
+    Format records as a table ordered by the call hierarchy.
+
+    Children of a call are sorted by their total time.
+
+    :param records: The records of profilers
+    :type records: dict
+    :return: The table
+    :rtype: str
+    """
+
+    header = ("name", "class", "calls", "total (s)", "mean (ms)", "pixels/call")
+    rows = []
+
+    def visit(parent):
+        children = [
+            key
+            for key in records
+            if len(key) == len(parent) + 1 and key[: len(parent)] == parent
+        ]
+        children.sort(key=lambda key: -records[key][1])
+
+        for key in children:
+            count, seconds, pixels = records[key]
+            label, cls = key[-1]
+            name = "  " * len(parent) + label
+            mean = seconds / count * 1000
+            rows.append(
+                (
+                    name,
+                    cls,
+                    str(count),
+                    f"{seconds:.3f}",
+                    f"{mean:.3f}",
+                    str(pixels // count),
+                )
+            )
+            visit(key)
+
+    visit(())
+
+    widths = [
+        max(len(row[idx]) for row in [header, *rows]) for idx in range(len(header))
+    ]
+    lines = []
+
+    for row in [header, *rows]:
+        cells = [row[0].ljust(widths[0]), row[1].ljust(widths[1])]
+        cells += [cell.rjust(width) for cell, width in zip(row[2:], widths[2:])]
+        lines.append("  ".join(cells).rstrip())
+
+    return "\n".join(lines)
+
+
+def _count_pixels(obj):
+    if isinstance(obj, (list, tuple)):
+        return sum(_count_pixels(item) for item in obj)
+    if isinstance(obj, dict):
+        obj = obj.get("image")
+
+    image = getattr(obj, "image", obj)
+    if not isinstance(image, np.ndarray) or image.ndim < 2:
+        return 0
+
+    return image.shape[0] * image.shape[1]
@@ -0,0 +1,172 @@
+"""
+SynthTIGER
+Copyright (c) 2021-present NAVER Corp.
+MIT license
+"""
+
+import contextlib
+import random
+import threading
+
+import imgaug
+import numpy as np
+
+_local = threading.local()
+
+
+class RandomContext:
+    """
+    Random states for generating a data.
+
+    The numpy generator and random state share a MT19937 bit generator seeded
+    in the same way as :func:`synthtiger.set_global_random_seed`, so drawing
+    from either of them advances the same stream. The imgaug RNG can be given
+    as seed of imgaug augmenters.
+
+    :param seed: The random seed
+    :type seed: int, optional
+    """
+
+    def __init__(self, seed=None):
+        bit_generator = np.random.MT19937(seed)
+        self.seed = seed
+        self.generator = np.random.Generator(bit_generator)
+        self.random_state = np.random.RandomState(bit_generator)
+        self.imgaug_rng = imgaug.random.RNG(imgaug.random.BIT_GENERATOR(seed))
+        self.python_random = random.Random(seed)
+
+
+class AliasSampler:
+    """
+    Sampler of indices with given weights in constant time by the alias method.
+
+    The tables are built once, so that sampling does not validate and
+    accumulate the weights as ``RandomState.choice`` does. Each sample draws
+    one uniform random number from :func:`get_random_state`, as many as
+    ``RandomState.choice`` does, so that the following draws are not shifted.
+
+    :param weights: The non-negative weights of indices
+    :type weights: list
+    """
+
+    def __init__(self, weights):
+        self.weights = np.array(weights, dtype=np.float64).reshape(-1)
+        self._probs = None
+        self._aliases = None
+
+        count = len(self.weights)
+        total = np.sum(self.weights)
+        if count == 0 or np.any(self.weights < 0) or not np.isfinite(total):
+            return
+        if total <= 0:
+            return
+
+        probs = self.weights * count / total
+        aliases = list(range(count))
+        smalls = [idx for idx in range(count) if probs[idx] < 1]
+        larges = [idx for idx in range(count) if probs[idx] >= 1]
+
+        while len(smalls) > 0 and len(larges) > 0:
+            small = smalls.pop()
+            large = larges.pop()
+            aliases[small] = large
+            probs[large] -= 1 - probs[small]
+            if probs[large] < 1:
+                smalls.append(large)
+            else:
+                larges.append(large)
+
+        # remaining ones are due to rounding errors
+        for idx in smalls + larges:
+            probs[idx] = 1
+
+        self._probs = probs.tolist()
+        self._aliases = aliases
+
+    def sample(self):
+        """
+        Sample an index.
+
+        :return: The sampled index
+        :rtype: int
+        """
+
+        if self._probs is None:
+            raise ValueError("Weights must be non-negative and sum to a positive")
+
+        random_state = get_random_state()
+        value = random_state.random_sample() * len(self._probs)
+        idx = int(value)
+
+        if value - idx < self._probs[idx]:
+            return idx
+        return self._aliases[idx]
+
+
+@contextlib.contextmanager
+def random_context(seed=None):
+    """
+    Use random states of the current thread seeded with seed.
+
+    Inside the context, the random state getters return the states of the
+    context instead of the global ones, so that threads can generate data in
+    parallel reproducibly.
+
+    :param seed: The random seed, or the random context to use
+    :type seed: int or RandomContext, optional
+    :return: The random context
+    :rtype: RandomContext
+    """
+
+    context = seed
+    if not isinstance(context, RandomContext):
+        context = RandomContext(seed)
+
+    prev_context = getattr(_local, "context", None)
+    _local.context = context
+
+    try:
+        yield context
+    finally:
+        _local.context = prev_context
+
+
+def get_random_context():
+    context = getattr(_local, "context", None)
+    return context
+
+
+def get_generator():
+    context = get_random_context()
+    if context is None:
+        return np.random.Generator(_get_global_bit_generator())
+    return context.generator
+
+
+def get_random_state():
+    context = get_random_context()
+    if context is None:
+        return np.random
+    return context.random_state
+
+
+def get_imgaug_rng():
+    context = get_random_context()
+    if context is None:
+        return imgaug.random.get_global_rng()
+    return context.imgaug_rng
+
+
+def get_python_random():
+    context = get_random_context()
+    if context is None:
+        return random
+    return context.python_random
+
+
+def _get_global_bit_generator():
+    if hasattr(np.random, "get_bit_generator"):
+        return np.random.get_bit_generator()
+
+    # numpy<1.25 has no public accessor of the global bit generator
+    return np.random.mtrand._rand._bit_generator
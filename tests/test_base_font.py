@@ -0,0 +1,39 @@
+"""
+SynthTIGER
+Copyright (c) 2021-present NAVER Corp.
+MIT license
+"""
+
+import os
+
+import numpy as np
+
+from synthtiger import components
+
+
+def test_font_table_cache(tmp_path):
+    """Test for font tables read from cache"""
+
+    args = {"paths": ["resources/font"], "weights": [1], "cache_dir": str(tmp_path)}
+
+    font = components.BaseFont(**args)
+    cached_font = components.BaseFont(**args)
+
+    assert len(os.listdir(tmp_path)) == 2
+    assert isinstance(cached_font._tables[0], np.memmap)
+    assert np.array_equal(font._tables[0], cached_font._tables[0])
+    assert font._ids == cached_font._ids
+    assert cached_font.sample({"text": "Ag"})["path"].endswith(".ttf")
+
+
+def test_font_candidates():
+    """Test for fonts that can render a text"""
+
+    font = components.BaseFont(paths=["resources/font"], weights=[1], cache_dir=None)
+    text = "Ag€"
+
+    charsets = [set(font._read_glyphs(path)) for path in font._paths[0]]
+    idxes = [idx for idx, charset in enumerate(charsets) if set(text) <= charset]
+
+    assert list(font._get_candidates(0, text)) == idxes
+    assert len(font._get_candidates(0, "")) == len(font._paths[0])
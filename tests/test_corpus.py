@@ -0,0 +1,211 @@
+"""
+SynthTIGER
+Copyright (c) 2021-present NAVER Corp.
+MIT license
+"""
+
+import gzip
+import os
+
+import numpy as np
+import pytest
+
+from synthtiger import components, utils
+
+
+def test_corpus_file(tmp_path):
+    """Test for texts read from binary corpus"""
+
+    texts = ["hello", "", "안녕하세요", "synthtiger"]
+    path = str(tmp_path / "texts.txt")
+    corpus_path = str(tmp_path / "texts.corpus")
+    with open(path, "w", encoding="utf-8") as fp:
+        fp.write("\n".join(texts) + "\n")
+
+    utils.write_corpus_file(corpus_path, texts)
+    corpus = components.BaseCorpus(paths=[path], weights=[1], cache_dir=None)
+    binary_corpus = components.BaseCorpus(
+        paths=[corpus_path], weights=[1], cache_dir=None
+    )
+    filtered_corpus = components.BaseCorpus(
+        paths=[corpus_path], weights=[1], min_length=6, cache_dir=None
+    )
+
+    assert binary_corpus._counts == corpus._counts
+    assert [binary_corpus._get_text(0, idx) for idx in range(len(texts))] == texts
+    assert [corpus._get_text(0, idx) for idx in range(len(texts))] == texts
+    assert [filtered_corpus._get_text(0, idx) for idx in range(1)] == ["synthtiger"]
+    assert filtered_corpus._counts == [1]
+
+
+def test_corpus_index_cache(tmp_path):
+    """Test for filtered texts read from index cache"""
+
+    path = str(tmp_path / "texts.txt")
+    with open(path, "w", encoding="utf-8", newline="") as fp:
+        fp.write("a\r\nbcd\n\nefgh\nij\r\n")
+
+    args = {"paths": [path], "weights": [1], "min_length": 2}
+    args["cache_dir"] = str(tmp_path / "cache")
+    corpus = components.BaseCorpus(**args)
+    cached_corpus = components.BaseCorpus(**args)
+    texts = ["bcd", "efgh", "ij"]
+
+    assert len(os.listdir(args["cache_dir"])) == 1
+    assert isinstance(cached_corpus._offsets[0], np.memmap)
+    assert [corpus._get_text(0, idx) for idx in range(3)] == texts
+    assert [cached_corpus._get_text(0, idx) for idx in range(3)] == texts
+
+
+def test_char_augmentable_corpus_dist(tmp_path):
+    """Test for rarity-weighted distribution of texts"""
+
+    texts = ["abc", "aab", "xyz", "", "ca", "가나a", "é😀é"]
+    charset = "abcx가é😀"
+    path = str(tmp_path / "texts.txt")
+    corpus_path = str(tmp_path / "texts.corpus")
+    charset_path = str(tmp_path / "charset.txt")
+    with open(path, "w", encoding="utf-8") as fp:
+        fp.write("\n".join(texts) + "\n")
+    with open(charset_path, "w", encoding="utf-8") as fp:
+        fp.write(charset)
+    utils.write_corpus_file(corpus_path, texts)
+
+    corpus = components.CharAugmentableCorpus(
+        paths=[path],
+        weights=[1],
+        augmentation=1,
+        augmentation_charset=charset_path,
+        cache_dir=str(tmp_path / "cache"),
+    )
+    cached_corpus = components.CharAugmentableCorpus(
+        paths=[path],
+        weights=[1],
+        augmentation=1,
+        augmentation_charset=charset_path,
+        cache_dir=str(tmp_path / "cache"),
+    )
+
+    binary_corpus = components.CharAugmentableCorpus(
+        paths=[corpus_path],
+        weights=[1],
+        augmentation=1,
+        augmentation_charset=charset_path,
+        cache_dir=None,
+    )
+
+    counts = {char: sum(char in text for text in texts) for char in charset}
+    dist = [sum(1 / counts[char] for char in set(text) & set(counts)) for text in texts]
+    dist = np.cumsum(np.array(dist) / sum(dist))
+
+    assert np.allclose(corpus._dists[0], dist)
+    assert np.allclose(binary_corpus._dists[0], dist)
+    assert isinstance(cached_corpus._dists[0], np.memmap)
+    assert np.array_equal(corpus._dists[0], cached_corpus._dists[0])
+
+
+def test_streaming_corpus(tmp_path):
+    """Test for texts sampled from blocks of streaming corpus"""
+
+    texts = [f"text{idx}" * (idx % 3) for idx in range(100)]
+    path = str(tmp_path / "texts.txt")
+    with open(path, "w", encoding="utf-8") as fp:
+        fp.write("\r\n".join(texts) + "\r\n")
+
+    corpus = components.StreamingCorpus(
+        paths=[path],
+        weights=[1],
+        min_length=1,
+        block_size=16,
+        cache_dir=str(tmp_path / "cache"),
+    )
+
+    assert len(corpus._blocks[0]) > 1
+    assert corpus._counts == [len(texts)]
+    assert [corpus._get_text(0, idx) for idx in range(len(texts))] == texts
+
+    with utils.random_context(0):
+        samples = [corpus.data(corpus.sample()) for _ in range(10)]
+    with utils.random_context(0):
+        assert [corpus.data(corpus.sample()) for _ in range(10)] == samples
+    assert all(len(sample) > 0 for sample in samples)
+
+
+def test_streaming_corpus_dir_cache(tmp_path):
+    """Test for block index of directory invalidated by changed files"""
+
+    root = tmp_path / "texts"
+    root.mkdir()
+    path = str(root / "texts.txt")
+    args = {"paths": [str(root)], "weights": [1], "cache_dir": str(tmp_path / "cache")}
+
+    with open(path, "w", encoding="utf-8") as fp:
+        fp.write("text\n" * 50)
+    assert components.StreamingCorpus(**args)._counts == [50]
+
+    with open(path, "w", encoding="utf-8") as fp:
+        fp.write("text\n" * 10)
+    corpus = components.StreamingCorpus(**args)
+    assert corpus._counts == [10]
+    assert corpus._get_text(0, 9) == "text"
+
+
+def test_streaming_corpus_default_cache(tmp_path, monkeypatch):
+    """Test for block index cached in default directory"""
+
+    monkeypatch.setenv("HOME", str(tmp_path))
+    path = str(tmp_path / "texts.txt")
+    with open(path, "w", encoding="utf-8") as fp:
+        fp.write("text\n" * 10)
+
+    corpus = components.StreamingCorpus(paths=[path], weights=[1])
+    cache_dir = tmp_path / ".cache" / "synthtiger"
+    assert len(list(cache_dir.glob("corpus_block_index_*.npy"))) == 1
+    assert components.StreamingCorpus(paths=[path], weights=[1])._counts == [10]
+    assert corpus._counts == [10]
+
+
+def test_streaming_corpus_gzip(tmp_path):
+    """Test for texts read from frames of gzip corpus"""
+
+    texts = [f"text{idx}" for idx in range(100)]
+    data = ("\n".join(texts) + "\n").encode("utf-8")
+    path = str(tmp_path / "texts.txt.gz")
+    with open(path, "wb") as fp:
+        for idx in range(0, len(data), 50):
+            fp.write(gzip.compress(data[idx : idx + 50]))
+
+    corpus = components.StreamingCorpus(paths=[path], weights=[1], cache_dir=None)
+
+    assert corpus._counts == [len(texts)]
+    assert [corpus._get_text(0, idx) for idx in range(len(texts))] == texts
+
+    single_path = str(tmp_path / "single.txt.gz")
+    with open(single_path, "wb") as fp:
+        fp.write(gzip.compress(data))
+
+    with pytest.raises(RuntimeError):
+        components.StreamingCorpus(
+            paths=[single_path], weights=[1], frame_cache_size=100, cache_dir=None
+        )
+
+
+def test_corpus_length_index(tmp_path):
+    """Test for texts sampled with length limits at sample time"""
+
+    texts = ["a" * (idx % 7) for idx in range(70)]
+    path = str(tmp_path / "texts.txt")
+    with open(path, "w", encoding="utf-8") as fp:
+        fp.write("\n".join(texts) + "\n")
+
+    corpus = components.LengthAugmentableCorpus(
+        paths=[path], weights=[1], augmentation=0.5, cache_dir=None
+    )
+
+    with utils.random_context(0):
+        samples = [corpus.sample({"min_length": 2, "max_length": 4}) for _ in range(50)]
+        assert all(2 <= len(sample["text"]) <= 4 for sample in samples)
+        samples = [corpus.sample({"min_length": 5}) for _ in range(50)]
+        assert all(len(sample["text"]) >= 5 for sample in samples)
+
+    assert corpus._get_length_range(0, 3, 3) == (30, 40)
@@ -0,0 +1,33 @@
+"""
+SynthTIGER
+Copyright (c) 2021-present NAVER Corp.
+MIT license
+"""
+
+import os
+import shutil
+
+from synthtiger import utils
+
+
+def test_manifest(tmp_path):
+    """Test for files listed from manifest"""
+
+    root = str(tmp_path)
+    shutil.copytree("resources/font", os.path.join(root, "font"))
+    paths = utils.search_files(root, exts=[".ttf"])
+
+    files = utils.write_manifest(root)
+    assert utils.read_manifest(root) == files
+    assert utils.search_files(root, exts=[".ttf"]) == paths
+
+    os.remove(paths[0])
+    assert utils.read_manifest(root) is None
+    assert utils.search_files(root, exts=[".ttf"], manifest=True) == paths[1:]
+    assert utils.read_manifest(root) is not None
+
+    with open(os.path.join(root, "new.ttf"), "wb"):
+        pass
+    assert utils.read_manifest(root) is None
+    assert utils.write_manifest(root) == utils.read_manifest(root)
+    assert sorted(os.listdir(root)) == [".synthtiger_manifest.json", "font", "new.ttf"]
@@ -0,0 +1,279 @@
+"""
+SynthTIGER
+Copyright (c) 2021-present NAVER Corp.
+MIT license
+"""
+
+import os
+import sys
+import textwrap
+
+import numpy as np
+import pytest
+
+import synthtiger
+from synthtiger import main
+
+
+def _generate(args, **kwargs):
+    config = synthtiger.read_config(args["config"])
+    generator = synthtiger.generator(
+        args["script"],
+        args["name"],
+        config=config,
+        seed=0,
+        **kwargs,
+    )
+
+    results = {}
+    for task_idx, data in generator:
+        results[task_idx] = (data["label"], np.array(data["image"]))
+
+    return results
+
+
+def _write_template(root, source):
+    path = os.path.join(root, "test_template.py")
+    header = """
+        import random
+
+        import numpy as np
+
+        from synthtiger import utils
+        from synthtiger.templates import Template
+
+        class BaseTemplate(Template):
+            def init_save(self, root, part=None):
+                pass
+
+            def save(self, root, data, idx):
+                pass
+
+            def end_save(self, root):
+                pass
+        """
+    with open(path, "w", encoding="utf-8") as fp:
+        fp.write(textwrap.dedent(header) + textwrap.dedent(source))
+    return path
+
+
+def _assert_equal(results, other_results):
+    assert results.keys() == other_results.keys()
+    for task_idx, (label, image) in results.items():
+        other_label, other_image = other_results[task_idx]
+        assert label == other_label
+        assert np.array_equal(image, other_image)
+
+
+@pytest.mark.skipif(sys.version_info < (3, 8), reason="requires python>=3.8")
+def test_shared_memory(synthtiger_horizontal_args):
+    """Test for data transferred through shared memory"""
+
+    results = _generate(synthtiger_horizontal_args, count=8, worker=2)
+    shm_results = _generate(
+        synthtiger_horizontal_args, count=8, worker=2, shared_memory=True
+    )
+    _assert_equal(results, shm_results)
+
+
+def test_worker_save(synthtiger_horizontal_args, tmp_path):
+    """Test for data saved in workers"""
+
+    args = synthtiger_horizontal_args
+    config = synthtiger.read_config(args["config"])
+    generator = synthtiger.generator(
+        args["script"],
+        args["name"],
+        config=config,
+        count=8,
+        worker=2,
+        seed=0,
+        output=str(tmp_path),
+    )
+
+    task_idxes = sorted(task_idx for task_idx, _ in generator)
+    synthtiger.merge_parts(str(tmp_path))
+
+    with open(os.path.join(tmp_path, "gt.txt"), "r", encoding="utf-8") as fp:
+        labels = dict(line.rstrip("\n").split("\t", 1) for line in fp)
+
+    results = _generate(args, count=8)
+    assert task_idxes == list(range(8))
+    assert not os.path.exists(os.path.join(tmp_path, "gt.0.txt"))
+    for task_idx, (label, _) in results.items():
+        key = os.path.join("images", "0", f"{task_idx}.jpg")
+        assert labels[key] == label
+
+
+def test_worker_error(tmp_path):
+    """Test for errors raised while saving in workers"""
+
+    script = _write_template(
+        tmp_path,
+        """
+        class ErrorTemplate(BaseTemplate):
+            def generate(self):
+                return {}
+
+            def save(self, root, data, idx):
+                raise ValueError("Failed to save")
+        """,
+    )
+
+    generator = synthtiger.generator(
+        script,
+        "ErrorTemplate",
+        count=4,
+        worker=2,
+        seed=0,
+        output=os.path.join(tmp_path, "output"),
+    )
+
+    with pytest.raises(RuntimeError, match="Failed to save"):
+        list(generator)
+
+
+def test_chunk(synthtiger_horizontal_args):
+    """Test for data generated in chunks"""
+
+    results = _generate(synthtiger_horizontal_args, count=8)
+    chunk_results = _generate(
+        synthtiger_horizontal_args, count=8, worker=2, chunk_size=3, prefetch=1
+    )
+    _assert_equal(results, chunk_results)
+
+
+def test_skip(synthtiger_horizontal_args):
+    """Test for skipping tasks of a previous generation"""
+
+    results = _generate(synthtiger_horizontal_args, count=6)
+    skip_results = _generate(synthtiger_horizontal_args, count=6, skip={1, 3})
+    assert sorted(skip_results) == [0, 2, 4, 5]
+    _assert_equal({idx: results[idx] for idx in skip_results}, skip_results)
+
+
+@pytest.mark.parametrize("options", [["--worker_save"], ["--checkpoint", "2"]])
+def test_resume(synthtiger_horizontal_args, tmp_path, monkeypatch, options):
+    """Test for labels kept across interrupted and resumed generations"""
+
+    args = synthtiger_horizontal_args
+    output = str(tmp_path)
+
+    for count in (3, 5, 8):
+        argv = ["synthtiger", "-o", output, "-c", str(count), "-w", "0", "-s", "0"]
+        argv += ["--resume", *options, args["script"], args["name"]]
+        argv += [args["config"]]
+        monkeypatch.setattr(sys, "argv", argv)
+        main.run(main.parse_args())
+
+        # part file left by a generation killed before recording its tasks
+        with open(os.path.join(tmp_path, "gt.0.txt"), "w", encoding="utf-8") as fp:
+            fp.write("images/0/100.jpg\tpartial")
+
+    with open(os.path.join(tmp_path, "gt.txt"), "r", encoding="utf-8") as fp:
+        lines = [line.rstrip("\n").split("\t", 1) for line in fp]
+        labels = dict(lines)
+
+    results = _generate(args, count=8)
+    assert len(lines) == len(results)
+    for task_idx, (label, _) in results.items():
+        key = os.path.join("images", "0", f"{task_idx}.jpg")
+        assert labels[key] == label
+
+
+def test_shard(synthtiger_horizontal_args):
+    """Test for data generated in shards"""
+
+    results = _generate(synthtiger_horizontal_args, count=6)
+    shard_results = {}
+    for idx in range(3):
+        shard_results.update(
+            _generate(synthtiger_horizontal_args, count=6, worker=1, shard=(idx, 3))
+        )
+    _assert_equal(results, shard_results)
+
+
+def test_stats(synthtiger_horizontal_args):
+    """Test for failure statistics without retries"""
+
+    args = synthtiger_horizontal_args
+    config = synthtiger.read_config(args["config"])
+    stats = {}
+    generator = synthtiger.generator(
+        args["script"],
+        args["name"],
+        config=config,
+        count=20,
+        seed=0,
+        max_retry=0,
+        stats=stats,
+    )
+
+    error = sum(data is None for _, data in generator)
+    assert sum(stats.values()) == error
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="requires fork start method")
+def test_prefork(synthtiger_horizontal_args):
+    """Test for data generated by workers forked with a template"""
+
+    results = _generate(synthtiger_horizontal_args, count=8)
+    prefork_results = _generate(
+        synthtiger_horizontal_args, count=8, worker=2, prefork=True
+    )
+    _assert_equal(results, prefork_results)
+
+
+def test_thread(synthtiger_horizontal_args):
+    """Test for data generated by worker threads"""
+
+    results = _generate(synthtiger_horizontal_args, count=8)
+    thread_results = _generate(
+        synthtiger_horizontal_args, count=8, worker=2, backend="thread"
+    )
+    _assert_equal(results, thread_results)
+
+
+def test_local_random(synthtiger_horizontal_args):
+    """Test for data generated without global random states"""
+
+    results = _generate(synthtiger_horizontal_args, count=8)
+    local_results = _generate(synthtiger_horizontal_args, count=8, global_random=False)
+    _assert_equal(results, local_results)
+
+
+def test_random_streams(tmp_path):
+    """Test for global random states independent of random context"""
+
+    script = _write_template(
+        tmp_path,
+        """
+        class RandomTemplate(BaseTemplate):
+            def generate(self):
+                global_values = [random.random(), np.random.rand()]
+                local_values = [
+                    utils.get_python_random().random(),
+                    utils.get_random_state().rand(),
+                ]
+                return global_values, local_values
+        """,
+    )
+    generator = synthtiger.generator(script, "RandomTemplate", count=4, seed=0)
+
+    for _, (global_values, local_values) in generator:
+        assert global_values[0] != local_values[0]
+        assert global_values[1] != local_values[1]
+
+
+def test_profile(synthtiger_horizontal_args):
+    """Test for profile records merged across workers"""
+
+    profile = {}
+    results = _generate(synthtiger_horizontal_args, count=4, worker=2, profile=profile)
+    count, seconds, _ = profile[(("SynthTiger.generate", "SynthTiger"),)]
+    assert count >= len(results)
+    assert seconds > 0
+    assert (
+        ("SynthTiger.generate", "SynthTiger"),
+        ("font.sample", "BaseFont"),
+    ) in profile
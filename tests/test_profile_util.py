@@ -0,0 +1,22 @@
+"""
+SynthTIGER
+Copyright (c) 2021-present NAVER Corp.
+MIT license
+"""
+
+from synthtiger import components, layers, utils
+
+
+def test_profile_apply():
+    """Test for pixels of layers applied by keyword"""
+
+    component = components.Opacity()
+    layer = layers.RectLayer((4, 2))
+
+    with utils.profile_context() as profiler:
+        component.apply([layer])
+        component.apply(layers=[layer])
+
+    count, _, pixels = profiler.records[(("Opacity.apply", "Opacity"),)]
+    assert count == 2
+    assert pixels == 16
@@ -0,0 +1,50 @@
+"""
+SynthTIGER
+Copyright (c) 2021-present NAVER Corp.
+MIT license
+"""
+
+import numpy as np
+import pytest
+
+from synthtiger import utils
+
+
+def test_alias_sampler():
+    """Test for frequencies of indices sampled by alias method"""
+
+    weights = [1, 0, 3, 6]
+    sampler = utils.AliasSampler(weights)
+
+    with utils.random_context(0):
+        idxes = [sampler.sample() for _ in range(100000)]
+
+    freqs = np.bincount(idxes, minlength=len(weights)) / len(idxes)
+    assert freqs[1] == 0
+    assert np.allclose(freqs, np.array(weights) / sum(weights), atol=0.01)
+
+    with utils.random_context(0):
+        assert [sampler.sample() for _ in range(100)] == idxes[:100]
+
+
+def test_alias_sampler_draws():
+    """Test for random draws consumed as many as choice"""
+
+    sampler = utils.AliasSampler([1, 2])
+
+    with utils.random_context(0):
+        sampler.sample()
+        value = utils.get_random_state().rand()
+
+    with utils.random_context(0):
+        utils.get_random_state().choice(2, p=[1 / 3, 2 / 3])
+        assert utils.get_random_state().rand() == value
+
+
+@pytest.mark.parametrize("weights", [(), (0, 0), (1, -1)])
+def test_alias_sampler_invalid(weights):
+    """Test for invalid weights"""
+
+    sampler = utils.AliasSampler(weights)
+    with pytest.raises(ValueError):
+        sampler.sample()
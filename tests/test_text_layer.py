@@ -0,0 +1,114 @@
+"""
+SynthTIGER
+Copyright (c) 2021-present NAVER Corp.
+MIT license
+"""
+
+import os
+import shutil
+
+import numpy as np
+import pytest
+
+from synthtiger import layers, utils
+
+
+@pytest.mark.parametrize("vertical", [False, True])
+def test_glyph_cache(vertical):
+    """Test for text layers rendered from glyph cache"""
+
+    cache = layers.TextLayer.glyph_cache
+    args = ("Ag", "resources/font/Ubuntu-Regular.ttf", 32)
+    kwargs = {"bold": True, "vertical": vertical}
+
+    cache.clear()
+    layer = layers.TextLayer(*args, **kwargs)
+    hits = cache.hits
+    cached_layer = layers.TextLayer(*args, **kwargs)
+
+    assert cache.hits == hits + 1
+    assert np.array_equal(layer.image, cached_layer.image)
+    assert np.array_equal(layer.bbox, cached_layer.bbox)
+    assert cached_layer.image.dtype == np.float32
+    assert cached_layer.image.flags.writeable
+
+
+def test_font_cache():
+    """Test for fonts shared by reading from font cache"""
+
+    path = "resources/font/Ubuntu-Regular.ttf"
+
+    utils.font_cache.clear()
+    font = utils.read_font(path, 32)
+    hits = utils.font_cache.hits
+
+    assert utils.read_font(path, 32) is font
+    assert utils.read_font(path, 16) is not font
+    assert utils.font_cache.hits == hits + 1
+
+
+def test_text_layer_from_chars():
+    """Test for char layers split from a text rendered at once"""
+
+    chars = ["W", "o", "r", "d"]
+    font = {"path": "resources/font/Ubuntu-Regular.ttf", "size": 32}
+
+    text_layer = layers.TextLayer("".join(chars), **font)
+    char_layers = layers.TextLayer.from_chars(chars, **font)
+    image = np.concatenate([char_layer.image for char_layer in char_layers], axis=1)
+
+    assert len(char_layers) == len(chars)
+    assert np.array_equal(image, text_layer.image)
+    assert all(char_layer.top == text_layer.top for char_layer in char_layers)
+
+
+def test_text_layer_backend():
+    """Test for text layers rendered by pygame backend"""
+
+    args = ("Ag", "resources/font/Ubuntu-Regular.ttf", 32)
+    layer = layers.TextLayer(*args)
+    pygame_layer = layers.TextLayer(*args, backend="pygame")
+
+    assert np.array_equal(layer.bbox, pygame_layer.bbox)
+    assert layer.image.shape == pygame_layer.image.shape
+    assert np.any(pygame_layer.image[..., 3] > 0)
+
+    color = (200, 100, 50, 255)
+    color_layer = layers.TextLayer(*args, color=color, backend="pygame")
+    mask = color_layer.image[..., 3] > 0
+    assert np.all(color_layer.image[mask, :3] == color[:3])
+    assert np.array_equal(color_layer.image[..., 3], pygame_layer.image[..., 3])
+
+    bold_layer = layers.TextLayer(*args, bold=True)
+    pygame_bold_layer = layers.TextLayer(*args, bold=True, backend="pygame")
+    assert np.array_equal(bold_layer.image, pygame_bold_layer.image)
+
+    with pytest.raises(RuntimeError):
+        layers.TextLayer(*args, backend="unknown")
+
+
+def test_glyph_atlas(tmp_path):
+    """Test for text layers read from glyph atlas"""
+
+    path = str(tmp_path / "Ubuntu-Regular.ttf")
+    shutil.copy("resources/font/Ubuntu-Regular.ttf", path)
+    color = (200, 100, 50, 255)
+    layer = layers.TextLayer("A", path, 32, bold=True)
+    color_layer = layers.TextLayer("A", path, 32, color=color, bold=True)
+    mask = layer.image[..., 3]
+    utils.write_glyph_atlas(path, [("A", 32, True, False, mask, layer.bbox)])
+
+    layers.TextLayer.glyph_cache.clear()
+    atlas = utils.read_glyph_atlas(path)
+    atlas_layer = layers.TextLayer("A", path, 32, bold=True)
+    atlas_color_layer = layers.TextLayer("A", path, 32, color=color, bold=True)
+
+    assert len(atlas) == 1
+    assert atlas.get("A", 32, False, False) is None
+    assert np.array_equal(layer.image, atlas_layer.image)
+    assert np.array_equal(layer.bbox, atlas_layer.bbox)
+    assert np.array_equal(color_layer.image, atlas_color_layer.image)
+
+    # atlas of replaced font is ignored
+    os.utime(path, ns=(0, 0))
+    assert utils.read_glyph_atlas(path) is None
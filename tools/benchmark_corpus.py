@@ -0,0 +1,108 @@
+"""
+SynthTIGER
+Copyright (c) 2021-present NAVER Corp.
+MIT license
+"""
+
+import argparse
+import pprint
+import resource
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from synthtiger import components, utils
+
+
+def benchmark(args, path):
+    start_time = time.time()
+    corpus = components.StreamingCorpus(
+        paths=[path],
+        weights=[1],
+        block_size=args.block_size,
+        frame_cache_size=args.frame_cache_size,
+        cache_dir=None,
+    )
+    load_time = time.time() - start_time
+
+    start_time = time.time()
+    with utils.random_context(args.seed):
+        for _ in range(args.count):
+            corpus.data(corpus.sample())
+    sample_time = time.time() - start_time
+
+    # kilobytes on Linux
+    memory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return load_time, sample_time, memory, len(corpus._blocks[0])
+
+
+def run(args):
+    for path in args.input:
+        # each corpus is measured in a new process for its peak memory
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            load_time, sample_time, memory, blocks = executor.submit(
+                benchmark, args, path
+            ).result()
+
+        throughput = args.count / sample_time
+        print(
+            f"{path}: {blocks} blocks, {load_time:.2f} seconds to index, "
+            f"{throughput:.2f} texts/s, {memory / 1024:.2f} MiB peak memory"
+        )
+
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "-c",
+        "--count",
+        metavar="NUM",
+        type=int,
+        default=10000,
+        help="Number of sampled texts. [default: 10000]",
+    )
+    parser.add_argument(
+        "-s",
+        "--seed",
+        metavar="NUM",
+        type=int,
+        default=0,
+        help="Random seed. [default: 0]",
+    )
+    parser.add_argument(
+        "--block_size",
+        metavar="NUM",
+        type=int,
+        default=2**16,
+        help="Byte size of blocks of text files. [default: 65536]",
+    )
+    parser.add_argument(
+        "--frame_cache_size",
+        metavar="NUM",
+        type=int,
+        default=2**26,
+        help="Byte size of cached frames of compressed files. [default: 67108864]",
+    )
+    parser.add_argument(
+        "input",
+        metavar="INPUT",
+        type=str,
+        nargs="+",
+        help="Corpus file paths to compare, e.g. corpus.txt corpus.txt.gz",
+    )
+    args = parser.parse_args()
+
+    pprint.pprint(vars(args))
+
+    return args
+
+
+def main():
+    start_time = time.time()
+    args = parse_args()
+    run(args)
+    end_time = time.time()
+    print(f"{end_time - start_time:.2f} seconds elapsed")
+
+
+if __name__ == "__main__":
+    main()
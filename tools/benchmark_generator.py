@@ -0,0 +1,128 @@
+"""
+SynthTIGER
+Copyright (c) 2021-present NAVER Corp.
+MIT license
+"""
+
+import argparse
+import pprint
+import time
+
+import synthtiger
+
+
+def benchmark(args, backend):
+    config = None
+    if args.config is not None:
+        config = synthtiger.read_config(args.config)
+
+    start_time = time.time()
+    first_time = None
+    generator = synthtiger.generator(
+        args.script,
+        args.name,
+        config=config,
+        count=args.count,
+        worker=args.worker,
+        seed=args.seed,
+        retry=True,
+        chunk_size=args.chunk_size,
+        backend=backend,
+    )
+
+    for _ in generator:
+        if first_time is None:
+            first_time = time.time() - start_time
+
+    total_time = time.time() - start_time
+    return first_time, total_time
+
+
+def run(args):
+    for backend in args.backend:
+        first_time, total_time = benchmark(args, backend)
+        throughput = args.count / total_time
+        print(
+            f"{backend}: {first_time:.2f} seconds to first data, "
+            f"{total_time:.2f} seconds in total, {throughput:.2f} data/s"
+        )
+
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "-c",
+        "--count",
+        metavar="NUM",
+        type=int,
+        default=100,
+        help="Number of output data. [default: 100]",
+    )
+    parser.add_argument(
+        "-w",
+        "--worker",
+        metavar="NUM",
+        type=int,
+        default=4,
+        help="Number of workers. [default: 4]",
+    )
+    parser.add_argument(
+        "--chunk_size",
+        metavar="NUM",
+        type=int,
+        default=1,
+        help="Number of tasks sent to a worker at once. [default: 1]",
+    )
+    parser.add_argument(
+        "-s",
+        "--seed",
+        metavar="NUM",
+        type=int,
+        default=0,
+        help="Random seed. [default: 0]",
+    )
+    parser.add_argument(
+        "--backend",
+        metavar="NAME",
+        type=str,
+        nargs="+",
+        default=["process", "thread"],
+        choices=["process", "thread"],
+        help="Types of workers to compare. [default: process thread]",
+    )
+    parser.add_argument(
+        "script",
+        metavar="SCRIPT",
+        type=str,
+        help="Script file path.",
+    )
+    parser.add_argument(
+        "name",
+        metavar="NAME",
+        type=str,
+        help="Template class name.",
+    )
+    parser.add_argument(
+        "config",
+        metavar="CONFIG",
+        type=str,
+        nargs="?",
+        help="Config file path.",
+    )
+    args = parser.parse_args()
+
+    pprint.pprint(vars(args))
+
+    return args
+
+
+def main():
+    start_time = time.time()
+    args = parse_args()
+    run(args)
+    end_time = time.time()
+    print(f"{end_time - start_time:.2f} seconds elapsed")
+
+
+if __name__ == "__main__":
+    main()
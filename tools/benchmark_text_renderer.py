@@ -0,0 +1,147 @@
+"""
+SynthTIGER
+Copyright (c) 2021-present NAVER Corp.
+MIT license
+"""
+
+import argparse
+import os
+import pprint
+import time
+
+import numpy as np
+
+from synthtiger import layers, utils
+
+
+def read_chars(path, count):
+    charset_path = f"{os.path.splitext(path)[0]}.txt"
+    chars = sorted(utils.read_charset(charset_path))
+    chars = [char for char in chars if not char.isspace()]
+    return chars[:count]
+
+
+def render(path, chars, size, bold, backend):
+    images = []
+
+    for char in chars:
+        layer = layers.TextLayer(char, path, size, bold=bold, backend=backend)
+        images.append(layer.image)
+
+    return images
+
+
+def compare(images, other_images):
+    diffs = []
+    ious = []
+
+    for image, other_image in zip(images, other_images):
+        height = max(image.shape[0], other_image.shape[0])
+        width = max(image.shape[1], other_image.shape[1])
+        alpha = np.zeros((height, width), dtype=np.float32)
+        other_alpha = np.zeros((height, width), dtype=np.float32)
+        alpha[: image.shape[0], : image.shape[1]] = image[..., 3]
+        other_alpha[: other_image.shape[0], : other_image.shape[1]] = other_image[
+            ..., 3
+        ]
+
+        mask = alpha > 127
+        other_mask = other_alpha > 127
+        union = np.sum(mask | other_mask)
+        diffs.append(np.mean(np.abs(alpha - other_alpha)))
+        ious.append(np.sum(mask & other_mask) / union if union > 0 else 1)
+
+    return np.mean(diffs), np.mean(ious)
+
+
+def run(args):
+    # measure rasterization, not cache lookups
+    layers.TextLayer.glyph_cache.resize(0)
+    paths = utils.search_files(args.input, exts=[".ttf", ".otf"])
+
+    for path in sorted(paths):
+        chars = read_chars(path, args.count)
+
+        for bold in (False, True):
+            outputs = {}
+
+            for backend in args.backend:
+                render(path, chars, args.size, bold, backend)
+                start_time = time.time()
+                for _ in range(args.repeat):
+                    outputs[backend] = render(path, chars, args.size, bold, backend)
+                total_time = time.time() - start_time
+                throughput = len(chars) * args.repeat / total_time
+                print(
+                    f"{os.path.basename(path)} (bold={bold}) {backend}: "
+                    f"{throughput:.2f} glyphs/s"
+                )
+
+            if len(outputs) == 2:
+                diff, iou = compare(*outputs.values())
+                print(
+                    f"{os.path.basename(path)} (bold={bold}) "
+                    f"mean alpha difference: {diff:.2f}, mask IoU: {iou:.4f}"
+                )
+
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "-c",
+        "--count",
+        metavar="NUM",
+        type=int,
+        default=100,
+        help="Number of chars rendered per font. [default: 100]",
+    )
+    parser.add_argument(
+        "-r",
+        "--repeat",
+        metavar="NUM",
+        type=int,
+        default=10,
+        help="Number of times chars are rendered. [default: 10]",
+    )
+    parser.add_argument(
+        "-s",
+        "--size",
+        metavar="NUM",
+        type=int,
+        default=48,
+        help="Font size. [default: 48]",
+    )
+    parser.add_argument(
+        "--backend",
+        metavar="NAME",
+        type=str,
+        nargs="+",
+        default=["pil", "pygame"],
+        choices=["pil", "pygame"],
+        help="Text rendering backends to compare. [default: pil pygame]",
+    )
+    parser.add_argument(
+        "input",
+        metavar="INPUT",
+        type=str,
+        nargs="?",
+        default="resources/font",
+        help="Directory path containing font files. [default: resources/font]",
+    )
+    args = parser.parse_args()
+
+    pprint.pprint(vars(args))
+
+    return args
+
+
+def main():
+    start_time = time.time()
+    args = parse_args()
+    run(args)
+    end_time = time.time()
+    print(f"{end_time - start_time:.2f} seconds elapsed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+SynthTIGER
+Copyright (c) 2021-present NAVER Corp.
+MIT license
+"""
+
+import argparse
+import os
+import pprint
+import time
+
+from synthtiger import components, utils
+
+
+def read_texts(path, corpus):
+    # lines are split only at line feeds, as in text corpora
+    with open(path, "r", encoding="utf-8", newline="\n") as fp:
+        for text in fp:
+            text = text.strip("\r\n")
+
+            if not corpus._check_length(text):
+                continue
+            if not corpus._check_charset(text):
+                continue
+
+            yield text
+
+
+def run(args):
+    # corpus without paths, used for its filters
+    corpus = components.BaseCorpus(
+        min_length=args.min_length,
+        max_length=args.max_length,
+        charset=args.charset,
+    )
+    meta = corpus._get_filters()
+
+    for path in args.input:
+        output_path = f"{os.path.splitext(path)[0]}{utils.corpus_util.CORPUS_EXT}"
+        texts = read_texts(path, corpus)
+        count = utils.write_corpus_file(output_path, texts, meta)
+        print(f"Created corpus ({count} texts) ({output_path})")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--min_length",
+        metavar="NUM",
+        type=int,
+        help="Minimum length of texts.",
+    )
+    parser.add_argument(
+        "--max_length",
+        metavar="NUM",
+        type=int,
+        help="Maximum length of texts.",
+    )
+    parser.add_argument(
+        "--charset",
+        metavar="PATH",
+        type=str,
+        help="Charset file path, texts with other chars are removed.",
+    )
+    parser.add_argument(
+        "input",
+        metavar="INPUT",
+        type=str,
+        nargs="+",
+        help="Text corpus file paths.",
+    )
+    args = parser.parse_args()
+
+    pprint.pprint(vars(args))
+
+    return args
+
+
+def main():
+    start_time = time.time()
+    args = parse_args()
+    run(args)
+    end_time = time.time()
+    print(f"{end_time - start_time:.2f} seconds elapsed")
+
+
+if __name__ == "__main__":
+    main()
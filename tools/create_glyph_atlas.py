@@ -0,0 +1,121 @@
+"""
+SynthTIGER
+Copyright (c) 2021-present NAVER Corp.
+MIT license
+"""
+
+import argparse
+import os
+import pprint
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from synthtiger import layers, utils
+
+
+def render_glyphs(path, sizes, verticals):
+    # glyphs are rendered, not read from cache or existing atlas
+    layers.TextLayer.glyph_cache.resize(0)
+    layers.TextLayer.glyph_atlas = False
+
+    charset_path = f"{os.path.splitext(path)[0]}.txt"
+    chars = sorted(utils.read_charset(charset_path))
+
+    for char in chars:
+        for size in sizes:
+            for bold in (False, True):
+                for vertical in verticals:
+                    layer = layers.TextLayer(
+                        char, path, size, bold=bold, vertical=vertical
+                    )
+                    mask = layer.image[..., 3].astype(np.uint8)
+                    bbox = layer.bbox.astype(int)
+                    yield char, size, bold, vertical, mask, bbox
+
+
+def create_atlas(path, sizes, verticals):
+    glyphs = render_glyphs(path, sizes, verticals)
+    count = utils.write_glyph_atlas(path, glyphs)
+    return count
+
+
+def run(args):
+    paths = utils.search_files(args.input, exts=[".ttf", ".otf"])
+    sizes = list(range(args.size[0], args.size[1] + 1))
+    verticals = [False, True] if args.vertical else [False]
+    executor = ProcessPoolExecutor(max_workers=args.worker)
+    futures = {}
+    count = 0
+
+    for path in paths:
+        future = executor.submit(create_atlas, path, sizes, verticals)
+        futures[future] = path
+
+    for future in as_completed(futures):
+        path = futures[future]
+
+        try:
+            glyph_count = future.result()
+        except:
+            print(f"{traceback.format_exc()} ({path})")
+            continue
+
+        count += 1
+        print(f"Created glyph atlas ({glyph_count} glyphs) ({path})")
+
+    executor.shutdown()
+    print(f"Created {count} glyph atlases")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "-s",
+        "--size",
+        metavar="NUM",
+        type=int,
+        nargs=2,
+        default=[40, 80],
+        help="Minimum and maximum font sizes. [default: 40 80]",
+    )
+    parser.add_argument(
+        "-v",
+        "--vertical",
+        action="store_true",
+        default=False,
+        help="Render vertical glyphs as well as horizontal ones.",
+    )
+    parser.add_argument(
+        "-w",
+        "--worker",
+        metavar="NUM",
+        type=int,
+        default=1,
+        help="Number of workers. [default: 1]",
+    )
+    parser.add_argument(
+        "input",
+        metavar="INPUT",
+        type=str,
+        help="Directory path containing font files and their charsets.",
+    )
+    args = parser.parse_args()
+
+    pprint.pprint(vars(args))
+
+    return args
+
+
+def main():
+    start_time = time.time()
+    args = parse_args()
+    run(args)
+    end_time = time.time()
+    print(f"{end_time - start_time:.2f} seconds elapsed")
+
+
+if __name__ == "__main__":
+    main()
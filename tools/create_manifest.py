@@ -0,0 +1,55 @@
+"""
+SynthTIGER
+Copyright (c) 2021-present NAVER Corp.
+MIT license
+"""
+
+import argparse
+import pprint
+import time
+
+from synthtiger import utils
+
+
+def run(args):
+    for root in args.input:
+        files = utils.write_manifest(root, image=not args.no_image)
+        if utils.read_manifest(root) is None:
+            print(f"Failed to write manifest ({root})")
+            continue
+
+        print(f"Created manifest ({len(files)} files) ({root})")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--no_image",
+        action="store_true",
+        default=False,
+        help="Do not read sizes and orientations of images.",
+    )
+    parser.add_argument(
+        "input",
+        metavar="INPUT",
+        type=str,
+        nargs="+",
+        help="Directory paths containing fonts or textures.",
+    )
+    args = parser.parse_args()
+
+    pprint.pprint(vars(args))
+
+    return args
+
+
+def main():
+    start_time = time.time()
+    args = parse_args()
+    run(args)
+    end_time = time.time()
+    print(f"{end_time - start_time:.2f} seconds elapsed")
+
+
+if __name__ == "__main__":
+    main()